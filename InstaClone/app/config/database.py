@@ -8,6 +8,11 @@ load_dotenv()
 
 DATABASE_URL = os.getenv('DATABASE_URL')
 
+# Dev/test mode: a relationship access that would emit SQL raises instead of quietly becoming an
+# N+1 query. Load what a response needs up front with the profiles in repository/loading.py.
+RAISELOAD = os.getenv('DB_RAISELOAD', 'false').lower() == 'true'
+LAZY = 'raise_on_sql' if RAISELOAD else 'select'
+
 engine = create_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
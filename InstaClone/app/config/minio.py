@@ -1,26 +1,85 @@
 import os
+import base64
+from urllib.parse import unquote, urlsplit
 import boto3
-from uuid import uuid4
+from botocore.config import Config
 from dotenv import load_dotenv
+from utils.presign_cache import PresignedURLCache
+from config.signing import BatchSigner
 
 load_dotenv()
 
+# Size of the urllib3 connection pool; the async adapter uses the same number of threads
+MINIO_MAX_CONNECTIONS = int(os.getenv('MINIO_MAX_CONNECTIONS', 20))
+
 s3_client = boto3.client(
     's3',
     endpoint_url=os.getenv('MINIO_ENDPOINT_URL'),
     aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
+    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+    config=Config(
+        max_pool_connections=MINIO_MAX_CONNECTIONS,
+        connect_timeout=float(os.getenv('MINIO_CONNECT_TIMEOUT', 3)),
+        read_timeout=float(os.getenv('MINIO_READ_TIMEOUT', 30)),
+        retries={'max_attempts': 3, 'mode': 'standard'}
+    )
 )
 
 MY_BUCKET = os.getenv('MY_BUCKET')
 
-def upload(directory, filename):
-    uid = uuid4()
-    object_key = 'posts/'+ str(uid.int) + '_' + filename
-    file_path = f'{directory}/{filename}'
-    s3_client.upload_file(file_path, MY_BUCKET, object_key)
-    image_url = s3_client.generate_presigned_url(
-        'get_object',
-        Params={'Bucket': MY_BUCKET, 'Key': object_key}
+PRESIGN_EXPIRES_IN = int(os.getenv('PRESIGN_EXPIRES_IN', 3600))
+
+presign_cache = PresignedURLCache(
+    max_entries=int(os.getenv('PRESIGN_CACHE_SIZE', 10_000)),
+    refresh_margin=int(os.getenv('PRESIGN_REFRESH_MARGIN', PRESIGN_EXPIRES_IN // 10))
+)
+
+batch_signer = BatchSigner(
+    endpoint_url=os.getenv('MINIO_ENDPOINT_URL'),
+    bucket=MY_BUCKET,
+    access_key=os.getenv('AWS_ACCESS_KEY_ID'),
+    secret_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+    region=os.getenv('AWS_REGION', os.getenv('AWS_DEFAULT_REGION', 'us-east-1')),
+    session_token=os.getenv('AWS_SESSION_TOKEN'),
+    public_prefixes=[prefix for prefix in os.getenv('PUBLIC_MEDIA_PREFIXES', '').split(',') if prefix]
+)
+
+def presigned_urls(object_keys):
+    # Feed-sized lookups: serve what we can from the cache and sign the rest in one batch
+    urls, missing = {}, []
+    for object_key in object_keys:
+        url = presign_cache.get(MY_BUCKET, object_key)
+        if url is None:
+            missing.append(object_key)
+        else:
+            urls[object_key] = url
+    for object_key, url in batch_signer.sign(missing, PRESIGN_EXPIRES_IN).items():
+        presign_cache.put(MY_BUCKET, object_key, url, PRESIGN_EXPIRES_IN)
+        urls[object_key] = url
+    return urls
+
+def presigned_url(object_key):
+    return presigned_urls([object_key])[object_key]
+
+def presigned_post(object_key, content_type, max_size, sha256, expires_in=600):
+    # The policy pins the key, the exact Content-Type, the size and the SHA-256 the client declared,
+    # so the client cannot swap any of them - storage rejects bytes that do not hash to it
+    checksum = sha256_checksum(sha256)
+    return s3_client.generate_presigned_post(
+        MY_BUCKET, object_key,
+        Fields={'Content-Type': content_type, 'x-amz-checksum-algorithm': 'SHA256', 'x-amz-checksum-sha256': checksum},
+        Conditions=[
+            {'Content-Type': content_type}, ['content-length-range', 1, max_size],
+            {'x-amz-checksum-algorithm': 'SHA256'}, {'x-amz-checksum-sha256': checksum}
+        ],
+        ExpiresIn=expires_in
     )
-    return image_url
\ No newline at end of file
+
+def sha256_checksum(sha256):
+    # S3 carries checksums base64-encoded; we store hex digests
+    return base64.b64encode(bytes.fromhex(sha256)).decode()
+
+def object_key_from_url(url):
+    # Works for presigned, public and virtual-host style URLs alike
+    path = unquote(urlsplit(url).path).lstrip('/')
+    return path[len(MY_BUCKET) + 1:] if path.startswith(f'{MY_BUCKET}/') else path
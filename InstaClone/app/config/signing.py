@@ -0,0 +1,89 @@
+import hmac
+import hashlib
+from datetime import datetime, timezone
+from urllib.parse import quote, urlsplit
+
+ALGORITHM = 'AWS4-HMAC-SHA256'
+
+def uri_encode(value, safe='-_.~'):
+    return quote(value, safe=safe)
+
+def hmac_sha256(key, message):
+    return hmac.new(key, message.encode('utf-8'), hashlib.sha256).digest()
+
+class BatchSigner:
+    """Presigns many GET URLs for one bucket with SigV4 query auth.
+
+    boto3 rebuilds the whole signing context on every generate_presigned_url call.
+    Here the signing key is derived once per day/region/service and everything
+    that does not depend on the object key is prepared once per batch, so signing
+    a feed page is a loop of two hashes and one HMAC per URL. Keys under a public
+    prefix get a plain unsigned URL. URLs are path-style, as MinIO expects.
+    """
+
+    def __init__(self, endpoint_url, bucket, access_key, secret_key, region='us-east-1',
+                 session_token=None, public_prefixes=(), service='s3'):
+        endpoint = urlsplit(endpoint_url or f'https://s3.{region}.amazonaws.com')
+        self.scheme = endpoint.scheme
+        self.host = endpoint.netloc
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.service = service
+        self.session_token = session_token
+        self.public_prefixes = tuple(public_prefixes)
+        self._signing_keys = {}
+
+    def signing_key(self, datestamp):
+        key = self._signing_keys.get(datestamp)
+        if key is None:
+            key = hmac_sha256(('AWS4' + self.secret_key).encode('utf-8'), datestamp)
+            for part in (self.region, self.service, 'aws4_request'):
+                key = hmac_sha256(key, part)
+            # Keys derived for earlier days are never needed again
+            self._signing_keys = {datestamp: key}
+        return key
+
+    def object_path(self, object_key):
+        return f'/{uri_encode(self.bucket)}/{uri_encode(object_key, safe="/-_.~")}'
+
+    def is_public(self, object_key):
+        return object_key.startswith(self.public_prefixes) if self.public_prefixes else False
+
+    def public_url(self, object_key):
+        return f'{self.scheme}://{self.host}{self.object_path(object_key)}'
+
+    def sign(self, object_keys, expires_in=3600, now=None):
+        """Return {object_key: url} for every key, signing all of them with one timestamp."""
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime('%Y%m%dT%H%M%SZ')
+        datestamp = amz_date[:8]
+        scope = f'{datestamp}/{self.region}/{self.service}/aws4_request'
+        signing_key = self.signing_key(datestamp)
+
+        params = {
+            'X-Amz-Algorithm': ALGORITHM,
+            'X-Amz-Credential': f'{self.access_key}/{scope}',
+            'X-Amz-Date': amz_date,
+            'X-Amz-Expires': str(expires_in),
+            'X-Amz-SignedHeaders': 'host',
+        }
+        if self.session_token:
+            params['X-Amz-Security-Token'] = self.session_token
+        query = '&'.join(f'{uri_encode(k)}={uri_encode(v)}' for k, v in sorted(params.items()))
+        request_suffix = f'\n{query}\nhost:{self.host}\n\nhost\nUNSIGNED-PAYLOAD'
+        string_to_sign_prefix = f'{ALGORITHM}\n{amz_date}\n{scope}\n'
+        base_url = f'{self.scheme}://{self.host}'
+
+        urls = {}
+        for object_key in object_keys:
+            path = self.object_path(object_key)
+            if self.is_public(object_key):
+                urls[object_key] = base_url + path
+                continue
+            canonical_request = 'GET\n' + path + request_suffix
+            string_to_sign = string_to_sign_prefix + hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
+            signature = hmac.new(signing_key, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
+            urls[object_key] = f'{base_url}{path}?{query}&X-Amz-Signature={signature}'
+        return urls
@@ -0,0 +1,130 @@
+import os
+import asyncio
+import hashlib
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from config.minio import s3_client, MY_BUCKET, MINIO_MAX_CONNECTIONS
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.disk_cache import DiskLRUCache
+
+class AsyncStorage:
+    """Awaitable wrapper around the blocking boto3 client.
+
+    Calls run on a bounded thread pool sized like the client's connection pool, so
+    a slow MinIO request only ever ties up one of those threads, never the event loop.
+    Every call goes through a circuit breaker, so during an outage callers get a
+    CircuitOpenError straight away instead of queueing up behind hung connections.
+    """
+
+    def __init__(self, client, bucket, max_workers=MINIO_MAX_CONNECTIONS, breaker=None):
+        self.client = client
+        self.bucket = bucket
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='storage')
+        self.breaker = breaker or CircuitBreaker('minio')
+
+    async def run(self, function):
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.breaker.name, self.breaker.retry_after())
+        loop = asyncio.get_running_loop()
+        ok = None
+        try:
+            result = await loop.run_in_executor(self.executor, function)
+            ok = True
+            return result
+        except ClientError as error:
+            # 4xx answers (missing key, bad range...) mean MinIO is up and talking to us
+            ok = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 500) < 500
+            raise
+        except Exception:
+            ok = False
+            raise
+        finally:
+            # Cancellation is a BaseException and says nothing about MinIO either way
+            if ok is None:
+                self.breaker.release()
+            elif ok:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+    async def call(self, method, **kwargs):
+        return await self.run(partial(getattr(self.client, method), **kwargs))
+
+    async def put_object(self, key, body, content_type=None):
+        extra = {'ContentType': content_type} if content_type else {}
+        return await self.call('put_object', Bucket=self.bucket, Key=key, Body=body, **extra)
+
+    async def create_multipart_upload(self, key, content_type=None):
+        extra = {'ContentType': content_type} if content_type else {}
+        response = await self.call('create_multipart_upload', Bucket=self.bucket, Key=key, **extra)
+        return response['UploadId']
+
+    async def upload_part(self, key, upload_id, part_number, body):
+        response = await self.call(
+            'upload_part', Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumber=part_number, Body=body
+        )
+        return response['ETag']
+
+    async def complete_multipart_upload(self, key, upload_id, parts):
+        return await self.call(
+            'complete_multipart_upload', Bucket=self.bucket, Key=key, UploadId=upload_id,
+            MultipartUpload={'Parts': parts}
+        )
+
+    async def abort_multipart_upload(self, key, upload_id):
+        return await self.call('abort_multipart_upload', Bucket=self.bucket, Key=key, UploadId=upload_id)
+
+    async def head_object(self, key, checksum=False):
+        extra = {'ChecksumMode': 'ENABLED'} if checksum else {}
+        return await self.call('head_object', Bucket=self.bucket, Key=key, **extra)
+
+    async def read(self, key):
+        def read():
+            return self.client.get_object(Bucket=self.bucket, Key=key)['Body'].read()
+        return await self.run(read)
+
+    async def sha256(self, key, chunk_size=1024 * 1024):
+        # Hashed as it streams through the worker thread, so large videos never sit in memory
+        def digest():
+            sha256 = hashlib.sha256()
+            for chunk in self.client.get_object(Bucket=self.bucket, Key=key)['Body'].iter_chunks(chunk_size):
+                sha256.update(chunk)
+            return sha256.hexdigest()
+        return await self.run(digest)
+
+    async def get_object(self, key, byte_range=None):
+        extra = {'Range': byte_range} if byte_range else {}
+        return await self.call('get_object', Bucket=self.bucket, Key=key, **extra)
+
+    async def read_range(self, key, start, end):
+        # Fetch and read in the same worker thread - the body is a blocking stream too
+        def read():
+            response = self.client.get_object(Bucket=self.bucket, Key=key, Range=f'bytes={start}-{end}')
+            return response['Body'].read()
+        return await self.run(read)
+
+    async def delete_objects(self, keys):
+        return await self.call(
+            'delete_objects', Bucket=self.bucket, Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True}
+        )
+
+    async def delete_object(self, key):
+        return await self.call('delete_object', Bucket=self.bucket, Key=key)
+
+storage = AsyncStorage(s3_client, MY_BUCKET, breaker=CircuitBreaker(
+    'minio',
+    failure_threshold=float(os.getenv('MINIO_BREAKER_FAILURE_RATE', 0.5)),
+    minimum_calls=int(os.getenv('MINIO_BREAKER_MIN_CALLS', 10)),
+    reset_timeout=float(os.getenv('MINIO_BREAKER_RESET_TIMEOUT', 15)),
+    half_open_timeout=float(os.getenv('MINIO_BREAKER_HALF_OPEN_TIMEOUT', 30))
+))
+
+# Hot media kept on local disk, so popular objects skip the MinIO round trip entirely
+media_cache = DiskLRUCache(
+    os.getenv('MEDIA_CACHE_DIR', 'media_cache'),
+    max_bytes=int(os.getenv('MEDIA_CACHE_MAX_BYTES', 2 * 1024 * 1024 * 1024)),
+    max_object_bytes=int(os.getenv('MEDIA_CACHE_MAX_OBJECT_BYTES', 64 * 1024 * 1024)),
+    admit_after=int(os.getenv('MEDIA_CACHE_ADMIT_AFTER', 2)),
+    retire_after=float(os.getenv('MEDIA_CACHE_RETIRE_AFTER', 60))
+)
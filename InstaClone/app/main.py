@@ -1,39 +1,146 @@
-from fastapi import FastAPI, Depends, File, UploadFile, HTTPException
+import os
+import asyncio
+import secrets
+from contextlib import asynccontextmanager
+from uuid import UUID
+from typing import List
+from fastapi import FastAPI, BackgroundTasks, Depends, File, Form, Request, UploadFile, HTTPException
+from fastapi.responses import JSONResponse
+from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import DataError, IntegrityError
+from starlette.concurrency import run_in_threadpool
 from schemas.posts import PostIn
 from schemas.users import UserIn
 from models.posts import Post
 from models.users import User
 from config.database import get_db
-from config.minio import upload
+from config.minio import presign_cache, presigned_url, object_key_from_url
+from config.storage import media_cache, storage
+from service.uploads import MAX_UPLOAD_BYTES, store_media, store_many, upload_summary
+from service import counters, outbox, timeline
+from repository import media as media_repository
+from router import comments, feed, follows, likes, media, posts, search, uploads
+from utils.hashing import Hash
+from utils.tokens import create_access_token, get_current_user
+from utils.upload_guard import UploadGuardMiddleware
+from utils.circuit_breaker import CircuitOpenError
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    outbox_worker = asyncio.create_task(outbox.run_worker())
+    counter_compactor = asyncio.create_task(counters.run_compactor())
+    timeline_trimmer = asyncio.create_task(timeline.run_trimmer())
+    yield
+    outbox_worker.cancel()
+    counter_compactor.cancel()
+    timeline_trimmer.cancel()
+
+app = FastAPI(lifespan=lifespan)
+
+MAX_CAROUSEL_FILES = 10
+
+# While MinIO is unreachable, spool /image uploads to the outbox instead of failing them
+SPOOL_WHEN_STORAGE_DOWN = os.getenv('SPOOL_WHEN_STORAGE_DOWN', 'true').lower() == 'true'
+
+app.include_router(comments.router)
+app.include_router(feed.router)
+app.include_router(follows.router)
+app.include_router(likes.router)
+app.include_router(media.router)
+app.include_router(posts.router)
+app.include_router(search.router)
+app.include_router(uploads.router)
+
+@app.exception_handler(CircuitOpenError)
+def storage_unavailable(request: Request, exc: CircuitOpenError):
+    return JSONResponse(
+        status_code=503, content={'detail': 'Media storage is temporarily unavailable. Please retry shortly.'},
+        headers={'Retry-After': str(max(1, round(exc.retry_after)))}
+    )
+
+app.add_middleware(UploadGuardMiddleware, paths=['/image', '/images', '/posts/upload'], limits=MAX_UPLOAD_BYTES)
 
 @app.post('/create')
-def create(post: PostIn, session: Session = Depends(get_db)):
+def create(post: PostIn, background_tasks: BackgroundTasks, session: Session = Depends(get_db)):
     new_post = Post(**post.model_dump())
+    # Variants and metadata come from what we stored under that key, never from the client
+    media = media_repository.get_by_key(session, object_key_from_url(post.file_url))
+    if media:
+        media_repository.attach(session, new_post, media)
     session.add(new_post)
     session.commit()
     session.refresh(new_post)
+    background_tasks.add_task(timeline.fan_out, new_post.uid)
     return new_post
 
 @app.post('/image')
-async def upload_image(uploaded_file: UploadFile = File(...)):
+async def upload_image(uploaded_file: UploadFile = File(...), session: Session = Depends(get_db)):
+    if uploaded_file.content_type.split('/')[0] not in ['image', 'video']:
+        raise HTTPException(status_code=400, detail="Unsupported File uploaded. Please upload image or video file!")
+    if SPOOL_WHEN_STORAGE_DOWN and storage.breaker.is_open():
+        object_key = await outbox.enqueue_object(uploaded_file, session)
+        return JSONResponse(status_code=202, content={
+            'msg': 'storage unavailable, image queued for upload', 'url': presigned_url(object_key), 'key': object_key,
+            'pending': True
+        })
+    media, duplicate = await store_media(uploaded_file, session)
+    return {'msg': 'image uploaded successfully with FastApi', **upload_summary(media, duplicate)}
+
+@app.post('/images')
+async def upload_images(uploaded_files: List[UploadFile] = File(...)):
+    if len(uploaded_files) > MAX_CAROUSEL_FILES:
+        raise HTTPException(status_code=400, detail=f"A post can have at most {MAX_CAROUSEL_FILES} files.")
+    if any(uploaded_file.content_type.split('/')[0] not in ['image', 'video'] for uploaded_file in uploaded_files):
+        raise HTTPException(status_code=400, detail="Unsupported File uploaded. Please upload image or video file!")
+    files = await store_many(uploaded_files)
+    return {'msg': 'images uploaded successfully with FastApi', 'files': files}
+
+@app.post('/posts/upload', status_code=202)
+async def upload_post(
+    uploaded_file: UploadFile = File(...), caption: str = Form(...), user_id: UUID = Form(...),
+    session: Session = Depends(get_db)
+):
+    # Answers as soon as the file is safely on local disk; the outbox worker ships it to MinIO
     if uploaded_file.content_type.split('/')[0] not in ['image', 'video']:
         raise HTTPException(status_code=400, detail="Unsupported File uploaded. Please upload image or video file!")
-    directory = 'static'
-    file = uploaded_file.filename
-    file_location = f'{directory}/{file}'
-    with open(file_location, 'wb') as f:
-        f.write(await uploaded_file.read())
-    url = upload(directory, file)
-    return {'msg': 'image uploaded successfully with FastApi', 'url': url}
+    try:
+        post = await outbox.enqueue(uploaded_file, caption, user_id, session)
+    except IntegrityError:
+        raise HTTPException(status_code=400, detail=f"User with id {user_id} not found.")
+    return {'msg': 'post accepted, media upload pending', 'post_id': post.uid, 'media_status': post.media_status}
+
+@app.delete('/posts/{uid}', status_code=204)
+async def delete_post(uid: UUID, user: User = Depends(get_current_user), session: Session = Depends(get_db)):
+    def delete():
+        post = session.get(Post, uid)
+        if not post:
+            raise HTTPException(status_code=404, detail=f'Post with id {uid} not found.')
+        if post.user_id != user.uid:
+            raise HTTPException(status_code=403, detail='You can only delete your own posts.')
+        session.delete(post)
+        # The bytes may be shared with other posts; only the last reference removes them
+        orphaned = media_repository.release(session, post)
+        session.commit()
+        return orphaned
+
+    orphaned = await run_in_threadpool(delete)
+    if orphaned:
+        await storage.delete_objects(orphaned)
+        for key in orphaned:
+            media_cache.invalidate(key)
+
+@app.get('/metrics/storage')
+def storage_metrics():
+    return {
+        'circuit_breaker': storage.breaker.metrics(), 'presign_cache': presign_cache.stats(),
+        'media_cache': media_cache.stats()
+    }
 
 @app.post('/create-user')
 def create_user(user: UserIn, session: Session = Depends(get_db)):
     try:
-        new_user = User(**user.model_dump())
+        new_user = User(**user.model_dump(exclude={'password'}), password=Hash.bcrypt(user.password))
         session.add(new_user)
         session.commit()
         session.refresh(new_user)
@@ -43,4 +150,22 @@ def create_user(user: UserIn, session: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=f"{ve}")
     except IntegrityError:
         raise HTTPException(status_code=400, detail="Username and/or Email already exists.")
-    return new_user
\ No newline at end of file
+    return new_user
+
+def password_matches(session: Session, user: User, entered: str):
+    if Hash.is_hashed(user.password):
+        return Hash.verify_password(entered, user.password)
+    # Stored as entered by an older /create-user: compare in constant time and keep the hash from now on
+    if not secrets.compare_digest(user.password.encode(), entered.encode()):
+        return False
+    user.password = Hash.bcrypt(entered)
+    session.commit()
+    return True
+
+@app.post('/login')
+def login(request: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_db)):
+    user = session.query(User).filter(User.username == request.username, User.deleted == False).first()
+    if not user or not password_matches(session, user, request.password):
+        raise HTTPException(status_code=401, detail='Incorrect Credentials!')
+    access_token = create_access_token(data={'sub': str(user.uid)})
+    return {'access_token': access_token, 'token_type': 'bearer'}
\ No newline at end of file
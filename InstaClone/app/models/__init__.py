@@ -1,3 +1,10 @@
 from models.posts import Base
 from models.users import Base
-from models.comments import Base
\ No newline at end of file
+from models.comments import Base
+from models.media import Base
+from models.uploads import Base
+from models.outbox import Base
+from models.follows import Base
+from models.timeline import Base
+from models.likes import Base
+from models.counters import Base
\ No newline at end of file
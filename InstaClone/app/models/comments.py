@@ -1,18 +1,24 @@
 from uuid import uuid4, UUID
+from datetime import datetime
 from typing import List
-from sqlalchemy import ForeignKey, Text
+from sqlalchemy import ForeignKey, Index, Text, func
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from config.database import Base
+from config.database import Base, LAZY
 
 class Comment(Base):
     __tablename__ = 'comments'
+    # A post's thread in keyset order, oldest first; also serves every lookup by post_id alone
+    __table_args__ = (Index('ix_comments_post_id_created_at_uid', 'post_id', 'created_at', 'uid'),)
 
     uid: Mapped[UUID] = mapped_column(primary_key=True, index=True, default=uuid4)
     text: Mapped[str] = mapped_column(Text, nullable=False)
     post_id: Mapped[UUID] = mapped_column(ForeignKey("posts.uid", ondelete="CASCADE"), nullable=False)
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.uid", ondelete="CASCADE"), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now, server_default=func.now(), nullable=False)
 
-    comment_liked_by: Mapped[List["User"]] = relationship(back_populates="comment_liked")
+    comment_liked_by: Mapped[List["User"]] = relationship(
+        secondary="comment_likes", back_populates="comment_liked", lazy=LAZY, passive_deletes=True
+    )
 
-    commented_by: Mapped["User"] = relationship(back_populates="comments")
-    commented_on: Mapped["Post"] = relationship(back_populates="comments")
\ No newline at end of file
+    commented_by: Mapped["User"] = relationship(back_populates="comments", lazy=LAZY)
+    commented_on: Mapped["Post"] = relationship(back_populates="comments", lazy=LAZY)
\ No newline at end of file
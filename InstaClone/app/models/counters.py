@@ -0,0 +1,20 @@
+from uuid import UUID
+from sqlalchemy import BigInteger, ForeignKey, Index, SmallInteger, text
+from sqlalchemy.orm import Mapped, mapped_column
+from config.database import Base
+
+class PostLikeCount(Base):
+    """One shard of a post's like count; the count is the sum over its shards.
+
+    Likes bump a random shard, so concurrent likes on a viral post update different rows
+    instead of queueing on one row lock. The compactor folds shards back into shard 0.
+    """
+    __tablename__ = 'post_like_counts'
+    # Shards above 0 only exist until the next compaction, so this stays as small as the backlog of recent likes
+    __table_args__ = (
+        Index('ix_post_like_counts_unfolded', 'post_id', postgresql_where=text('shard > 0'), sqlite_where=text('shard > 0')),
+    )
+
+    post_id: Mapped[UUID] = mapped_column(ForeignKey("posts.uid", ondelete="CASCADE"), primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
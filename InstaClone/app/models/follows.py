@@ -0,0 +1,14 @@
+from uuid import UUID
+from datetime import datetime
+from sqlalchemy import ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from config.database import Base
+
+class Follow(Base):
+    __tablename__ = 'follows'
+    # The primary key answers "who do I follow"; this index answers "who follows me" for fan-out
+    __table_args__ = (Index('ix_follows_followee_id_follower_id', 'followee_id', 'follower_id'),)
+
+    follower_id: Mapped[UUID] = mapped_column(ForeignKey("users.uid", ondelete="CASCADE"), primary_key=True)
+    followee_id: Mapped[UUID] = mapped_column(ForeignKey("users.uid", ondelete="CASCADE"), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
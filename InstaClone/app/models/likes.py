@@ -0,0 +1,24 @@
+from uuid import UUID
+from datetime import datetime
+from sqlalchemy import ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from config.database import Base
+
+# Primary keys lead with user_id, so "which of these posts did I like" is one index range per viewer;
+# the reverse indexes list who liked something and serve the ON DELETE CASCADE from posts/comments.
+
+class PostLike(Base):
+    __tablename__ = 'post_likes'
+    __table_args__ = (Index('ix_post_likes_post_id_user_id', 'post_id', 'user_id'),)
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.uid", ondelete="CASCADE"), primary_key=True)
+    post_id: Mapped[UUID] = mapped_column(ForeignKey("posts.uid", ondelete="CASCADE"), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+
+class CommentLike(Base):
+    __tablename__ = 'comment_likes'
+    __table_args__ = (Index('ix_comment_likes_comment_id_user_id', 'comment_id', 'user_id'),)
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.uid", ondelete="CASCADE"), primary_key=True)
+    comment_id: Mapped[UUID] = mapped_column(ForeignKey("comments.uid", ondelete="CASCADE"), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
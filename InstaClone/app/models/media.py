@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import BigInteger, JSON, String
+from sqlalchemy.orm import validates, Mapped, mapped_column
+from config.database import Base
+from utils import media_keys
+
+class MediaObject(Base):
+    __tablename__ = 'media_objects'
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    object_key: Mapped[str] = mapped_column(unique=True, nullable=False)
+    media_id: Mapped[Optional[str]] = mapped_column(index=True, nullable=True)
+    etag: Mapped[str] = mapped_column(nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    content_type: Mapped[str] = mapped_column(nullable=False)
+    variants: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    media_info: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # Posts referencing this content; uploads alone hold none (see repository/media.py)
+    ref_count: Mapped[int] = mapped_column(default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+    last_used_at: Mapped[datetime] = mapped_column(default=datetime.now, nullable=False)
+
+    @validates('object_key')
+    def validate_object_key(self, key, value):
+        self.media_id = media_keys.media_id(value)
+        return value
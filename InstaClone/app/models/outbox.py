@@ -0,0 +1,23 @@
+from uuid import uuid4, UUID
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import ForeignKey, Index, String, Text, types
+from sqlalchemy.orm import Mapped, mapped_column
+from config.database import Base
+
+class OutboxUpload(Base):
+    __tablename__ = 'upload_outbox'
+    __table_args__ = (Index('ix_upload_outbox_due', 'host', 'status', 'next_attempt_at'),)
+
+    uid: Mapped[UUID] = mapped_column(types.Uuid, primary_key=True, index=True, default=uuid4)
+    post_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("posts.uid", ondelete="CASCADE"), nullable=True)
+    object_key: Mapped[str] = mapped_column(nullable=False)
+    local_path: Mapped[str] = mapped_column(nullable=False)
+    host: Mapped[str] = mapped_column(nullable=False)
+    content_type: Mapped[str] = mapped_column(nullable=False)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    status: Mapped[str] = mapped_column(default='pending', nullable=False)
+    attempts: Mapped[int] = mapped_column(default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(default=datetime.now, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
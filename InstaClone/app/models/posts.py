@@ -1,18 +1,74 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from uuid import uuid4, UUID
-from sqlalchemy import ForeignKey, types
-from sqlalchemy.orm import relationship, Mapped, mapped_column
-from config.database import Base
+from sqlalchemy import BigInteger, Computed, ForeignKey, Index, JSON, Text, func, types
+from sqlalchemy.orm import validates, relationship, Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from config.database import Base, LAZY
+from utils import media_keys, perceptual_hash, sql
 
 class Post(Base):
     __tablename__ = 'posts'
+    # Keyset pagination order: newest first, uid breaking ties between posts created in the same instant.
+    # The user_id one serves a single author's posts (celebrity posts merged into timelines).
+    __table_args__ = (
+        Index('ix_posts_created_at_uid', 'created_at', 'uid'),
+        Index('ix_posts_user_id_created_at_uid', 'user_id', 'created_at', 'uid'),
+        Index('ix_posts_search_vector', 'search_vector', postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
 
     uid: Mapped[UUID] = mapped_column(types.Uuid, primary_key=True, index=True, default=uuid4)
     file_url: Mapped[str] = mapped_column(nullable=False)
+    media_id: Mapped[Optional[str]] = mapped_column(index=True, nullable=True)
+    # The stored content this post holds a reference on (see repository/media.py). Set server-side only;
+    # None for media that never went through our uploads, which is left to the garbage collector.
+    media_sha256: Mapped[Optional[str]] = mapped_column(
+        ForeignKey('media_objects.sha256', ondelete='SET NULL'), index=True, nullable=True
+    )
     caption: Mapped[str] = mapped_column(nullable=True)
+    variants: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # width/height, size, mime_type, duration (video) and blurhash, so feeds can lay out media before fetching it
+    media_info: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # Perceptual hash of images plus its bands, each indexed for near-duplicate lookups (see utils/perceptual_hash.py)
+    phash: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    phash_band_0: Mapped[Optional[int]] = mapped_column(index=True, nullable=True)
+    phash_band_1: Mapped[Optional[int]] = mapped_column(index=True, nullable=True)
+    phash_band_2: Mapped[Optional[int]] = mapped_column(index=True, nullable=True)
+    phash_band_3: Mapped[Optional[int]] = mapped_column(index=True, nullable=True)
+    media_status: Mapped[str] = mapped_column(default='ready', server_default='ready', nullable=False)
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.uid", ondelete="CASCADE"), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now, server_default=func.now(), nullable=False)
+    # Kept in step with the comments table, so cards show a count without a COUNT over the thread
+    comments_count: Mapped[int] = mapped_column(default=0, server_default='0', nullable=False)
+    # Caption search (PostgreSQL; SQLite searches the posts_fts table instead). Deferred: feeds never need it.
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR().with_variant(Text(), 'sqlite'),
+        Computed(sql.SearchDocument('english', ('A', 'caption')), persisted=True), deferred=True
+    )
 
-    post_liked_by: Mapped[List["User"]] = relationship(back_populates="post_liked")
-    comments: Mapped[List["Comment"]] = relationship(back_populates="commented_on")
+    # The foreign keys cascade in the database, so deleting a post need not load these first (passive_deletes)
+    post_liked_by: Mapped[List["User"]] = relationship(
+        secondary="post_likes", back_populates="post_liked", lazy=LAZY, passive_deletes=True
+    )
+    comments: Mapped[List["Comment"]] = relationship(
+        back_populates="commented_on", lazy=LAZY, cascade='all, delete', passive_deletes=True
+    )
 
-    posted_by: Mapped["User"] = relationship(back_populates="posts")
\ No newline at end of file
+    posted_by: Mapped["User"] = relationship(back_populates="posts", lazy=LAZY)
+
+    @validates('file_url')
+    def validate_file_url(self, key, value):
+        # Kept alongside the URL so storage GC can look posts up by object without parsing URLs in SQL
+        self.media_id = media_keys.media_id(value)
+        return value
+
+    @validates('media_info')
+    def validate_media_info(self, key, value):
+        phash = (value or {}).get('phash')
+        self.phash = perceptual_hash.parse(phash) if phash else None
+        bands = perceptual_hash.bands(self.phash) if phash else [None] * perceptual_hash.BANDS
+        for band, band_value in enumerate(bands):
+            setattr(self, f'phash_band_{band}', band_value)
+        return value
+
+sql.add_fts5_index(Post.__table__, ['caption'])
@@ -0,0 +1,17 @@
+from uuid import UUID
+from datetime import datetime
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from config.database import Base
+
+class TimelineEntry(Base):
+    """A post materialised into one user's home timeline at write time.
+
+    The primary key is the read order, so a timeline page is one range scan on (user_id, created_at, post_id).
+    """
+    __tablename__ = 'timeline_entries'
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.uid", ondelete="CASCADE"), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(primary_key=True)
+    post_id: Mapped[UUID] = mapped_column(ForeignKey("posts.uid", ondelete="CASCADE"), primary_key=True, index=True)
+    author_id: Mapped[UUID] = mapped_column(nullable=False)
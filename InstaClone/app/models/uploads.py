@@ -0,0 +1,32 @@
+from uuid import uuid4, UUID
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import BigInteger, ForeignKey, JSON, String, types
+from sqlalchemy.orm import Mapped, mapped_column
+from config.database import Base
+
+class ResumableUpload(Base):
+    __tablename__ = 'resumable_uploads'
+
+    uid: Mapped[UUID] = mapped_column(types.Uuid, primary_key=True, index=True, default=uuid4)
+    # None only for uploads started before owners were recorded; nobody can resume those
+    user_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("users.uid", ondelete="CASCADE"), index=True, nullable=True)
+    object_key: Mapped[str] = mapped_column(nullable=False)
+    upload_id: Mapped[str] = mapped_column(nullable=False)
+    content_type: Mapped[str] = mapped_column(nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    offset: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    parts: Mapped[List[dict]] = mapped_column(JSON, default=list, nullable=False)
+    completed: Mapped[bool] = mapped_column(default=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+
+
+class PendingUpload(Base):
+    """A presigned POST handed to a user; confirming it is single use and only open to that user."""
+    __tablename__ = 'pending_uploads'
+
+    object_key: Mapped[str] = mapped_column(primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.uid", ondelete="CASCADE"), index=True, nullable=False)
+    content_type: Mapped[str] = mapped_column(nullable=False)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now, index=True)
@@ -2,10 +2,12 @@ from enum import Enum
 from regex import regex
 from uuid import uuid4, UUID
 from datetime import datetime
-from typing import List
-from sqlalchemy import event, types
+from typing import List, Optional
+from sqlalchemy import Computed, Index, Text, event, types
 from sqlalchemy.orm import validates, relationship, Mapped, mapped_column
-from config.database import Base
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from config.database import Base, LAZY
+from utils import sql
 
 class GenderEnum(Enum):
     MALE = 'male'
@@ -18,6 +20,9 @@ class RoleEnum(Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index('ix_users_search_vector', 'search_vector', postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
 
     uid: Mapped[UUID] = mapped_column(types.Uuid, primary_key=True, index=True, default=uuid4)
     email: Mapped[str] = mapped_column(unique=True, nullable=False)
@@ -31,13 +36,27 @@ class User(Base):
     deleted: Mapped[bool] = mapped_column(default=False)
     role: Mapped[RoleEnum] = mapped_column(default=RoleEnum.USER, nullable=False)
     pg_16: Mapped[bool] = mapped_column(default=True)
+    followers_count: Mapped[int] = mapped_column(default=0, server_default='0', nullable=False)
     created_at: Mapped[datetime] = mapped_column(default=datetime.now)
     updated_at: Mapped[datetime] = mapped_column(default=datetime.now)
+    # Username and bio search, usernames ranked higher (PostgreSQL; SQLite searches users_fts instead)
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR().with_variant(Text(), 'sqlite'),
+        Computed(sql.SearchDocument('english', ('A', 'username'), ('B', 'bio')), persisted=True), deferred=True
+    )
 
-    posts: Mapped[List["Post"]] = relationship(back_populates='posted_by')
-    comments: Mapped[List["Comment"]] = relationship(back_populates='commented_by')
-    post_liked: Mapped[List["Post"]] = relationship(back_populates="post_liked_by")
-    comment_liked: Mapped[List["Comment"]] = relationship(back_populates="comment_liked_by")
+    posts: Mapped[List["Post"]] = relationship(
+        back_populates='posted_by', lazy=LAZY, cascade='all, delete', passive_deletes=True
+    )
+    comments: Mapped[List["Comment"]] = relationship(
+        back_populates='commented_by', lazy=LAZY, cascade='all, delete', passive_deletes=True
+    )
+    post_liked: Mapped[List["Post"]] = relationship(
+        secondary="post_likes", back_populates="post_liked_by", lazy=LAZY, passive_deletes=True
+    )
+    comment_liked: Mapped[List["Comment"]] = relationship(
+        secondary="comment_likes", back_populates="comment_liked_by", lazy=LAZY, passive_deletes=True
+    )
 
     @validates('email')
     def validate_email(self, key, value):
@@ -49,4 +68,6 @@ class User(Base):
 @event.listens_for(User, 'before_insert')
 def validate(mapper, connection, target):
     if target.age > 16:
-        target.pg_16 = False
\ No newline at end of file
+        target.pg_16 = False
+
+sql.add_fts5_index(User.__table__, ['username', 'bio'])
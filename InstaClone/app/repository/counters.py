@@ -0,0 +1,56 @@
+import os
+import random
+from uuid import UUID
+from sqlalchemy import BigInteger, cast, delete, func, select
+from sqlalchemy.orm import Session
+from models.counters import PostLikeCount
+from utils import sql
+
+# More shards spread a hot post's likes over more rows (less lock contention) but make reads sum more rows
+LIKE_COUNTER_SHARDS = int(os.getenv('LIKE_COUNTER_SHARDS', 16))
+
+def add_post_likes(session: Session, post_id: UUID, delta: int, shards: int = LIKE_COUNTER_SHARDS):
+    """Add `delta` to one random shard of the post's like count. Does not commit."""
+    statement = sql.insert(session, PostLikeCount).values(post_id=post_id, shard=random.randrange(shards), count=delta)
+    session.execute(statement.on_conflict_do_update(
+        index_elements=[PostLikeCount.post_id, PostLikeCount.shard],
+        set_={'count': PostLikeCount.count + statement.excluded.count}
+    ))
+
+def post_like_counts(session: Session, post_ids):
+    """{post_id: likes} for a page of posts in one grouped query; posts without likes are left out."""
+    if not post_ids:
+        return {}
+    return dict(session.execute(
+        # SUM(bigint) is NUMERIC on PostgreSQL; cast back so callers get ints
+        select(PostLikeCount.post_id, cast(func.sum(PostLikeCount.count), BigInteger))
+        .where(PostLikeCount.post_id.in_(post_ids)).group_by(PostLikeCount.post_id)
+    ).all())
+
+def sharded_posts(session: Session, limit: int):
+    """Posts liked since they were last compacted - those with a shard above 0.
+
+    Read from the partial ix_post_like_counts_unfolded index, so the cost follows recent likes,
+    not the size of the table.
+    """
+    return session.scalars(
+        select(PostLikeCount.post_id).where(PostLikeCount.shard > 0).group_by(PostLikeCount.post_id).limit(limit)
+    ).all()
+
+def compact_post_likes(session: Session, post_id: UUID):
+    """Fold shards 1..N into shard 0 in one transaction.
+
+    A like racing with this either lands before the DELETE (and is folded in) or waits for its
+    row lock and then re-inserts the shard; nothing is lost or counted twice.
+    """
+    folded = session.scalars(
+        delete(PostLikeCount).where(PostLikeCount.post_id == post_id, PostLikeCount.shard > 0)
+        .returning(PostLikeCount.count)
+    ).all()
+    if folded:
+        statement = sql.insert(session, PostLikeCount).values(post_id=post_id, shard=0, count=sum(folded))
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[PostLikeCount.post_id, PostLikeCount.shard],
+            set_={'count': PostLikeCount.count + statement.excluded.count}
+        ))
+    session.commit()
@@ -0,0 +1,41 @@
+from uuid import UUID
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models.follows import Follow
+from models.users import User
+
+def follow(session: Session, follower_id: UUID, followee_id: UUID):
+    """False if the follow already existed."""
+    session.add(Follow(follower_id=follower_id, followee_id=followee_id))
+    try:
+        session.flush()
+    except IntegrityError:
+        session.rollback()
+        return False
+    # Kept on the user so the celebrity check on every post is a primary key lookup, not a COUNT
+    session.execute(update(User).where(User.uid == followee_id).values(followers_count=User.followers_count + 1))
+    session.commit()
+    return True
+
+def unfollow(session: Session, follower_id: UUID, followee_id: UUID):
+    result = session.execute(delete(Follow).where(Follow.follower_id == follower_id, Follow.followee_id == followee_id))
+    if not result.rowcount:
+        session.rollback()
+        return False
+    session.execute(update(User).where(User.uid == followee_id).values(followers_count=User.followers_count - 1))
+    session.commit()
+    return True
+
+def follower_ids(session: Session, followee_id: UUID, limit: int, after: UUID = None):
+    """One batch of followers in follower_id order, resuming after the last id of the previous batch."""
+    query = select(Follow.follower_id).where(Follow.followee_id == followee_id)
+    if after is not None:
+        query = query.where(Follow.follower_id > after)
+    return session.scalars(query.order_by(Follow.follower_id).limit(limit)).all()
+
+def celebrities_followed(session: Session, follower_id: UUID, threshold: int):
+    return session.scalars(
+        select(Follow.followee_id).join(User, User.uid == Follow.followee_id)
+        .where(Follow.follower_id == follower_id, User.followers_count >= threshold)
+    ).all()
@@ -0,0 +1,59 @@
+from uuid import UUID
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models.likes import CommentLike, PostLike
+from repository import counters as counters_repository
+
+def add(session: Session, like):
+    """Stage a PostLike/CommentLike; False (and rolled back) if the user had already liked it."""
+    session.add(like)
+    try:
+        session.flush()
+    except IntegrityError:
+        session.rollback()
+        return False
+    return True
+
+def like_post(session: Session, user_id: UUID, post_id: UUID):
+    if not add(session, PostLike(user_id=user_id, post_id=post_id)):
+        return False
+    # Same transaction as the like row, so the count can never drift from the likes
+    counters_repository.add_post_likes(session, post_id, 1)
+    session.commit()
+    return True
+
+def unlike_post(session: Session, user_id: UUID, post_id: UUID):
+    result = session.execute(delete(PostLike).where(PostLike.user_id == user_id, PostLike.post_id == post_id))
+    if result.rowcount:
+        counters_repository.add_post_likes(session, post_id, -1)
+    session.commit()
+    return bool(result.rowcount)
+
+def like_comment(session: Session, user_id: UUID, comment_id: UUID):
+    if not add(session, CommentLike(user_id=user_id, comment_id=comment_id)):
+        return False
+    session.commit()
+    return True
+
+def unlike_comment(session: Session, user_id: UUID, comment_id: UUID):
+    result = session.execute(
+        delete(CommentLike).where(CommentLike.user_id == user_id, CommentLike.comment_id == comment_id)
+    )
+    session.commit()
+    return bool(result.rowcount)
+
+def liked_post_ids(session: Session, user_id: UUID, post_ids):
+    """The subset of post_ids the user has liked, in one primary key lookup."""
+    if not post_ids:
+        return set()
+    return set(session.scalars(
+        select(PostLike.post_id).where(PostLike.user_id == user_id, PostLike.post_id.in_(post_ids))
+    ))
+
+def liked_comment_ids(session: Session, user_id: UUID, comment_ids):
+    if not comment_ids:
+        return set()
+    return set(session.scalars(
+        select(CommentLike.comment_id).where(CommentLike.user_id == user_id, CommentLike.comment_id.in_(comment_ids))
+    ))
@@ -0,0 +1,14 @@
+from sqlalchemy.orm import joinedload
+from models.comments import Comment
+from models.posts import Post
+
+# Named eager-loading profiles, one per response shape, passed to query .options(). Each
+# loads everything its response serializes in a fixed number of queries, whatever the page size.
+
+# A post in a feed or grid: the post and its author
+FEED_CARD = (joinedload(Post.posted_by),)
+# A single post page: its author. Comments are paged separately (repository/comments.py),
+# never through Post.comments - a popular post's whole thread is too big to load at once.
+POST_DETAIL = (joinedload(Post.posted_by),)
+# A comment in a thread: the comment and its author
+COMMENT = (joinedload(Comment.commented_by),)
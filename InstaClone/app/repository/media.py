@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from config.minio import PRESIGN_EXPIRES_IN
+from models.media import MediaObject
+from models.posts import Post
+
+# References are held by posts, not uploads. Content handed to an uploader (fresh or deduplicated)
+# may be about to become a post, so it outlives its last post for this long; the GC collects it after.
+REUSE_GRACE = timedelta(seconds=PRESIGN_EXPIRES_IN)
+
+def add_reference(session: Session, sha256: str):
+    """Hand out already stored content again (deduplication), or return None if it is new."""
+    result = session.execute(
+        update(MediaObject).where(MediaObject.sha256 == sha256).values(last_used_at=datetime.now())
+    )
+    if not result.rowcount:
+        return None
+    session.commit()
+    return session.get(MediaObject, sha256)
+
+def create(session: Session, sha256: str, object_key: str, etag: str, size: int, content_type: str, media_info: dict = None):
+    """Record freshly uploaded content; None means someone else stored the same bytes first."""
+    media = MediaObject(
+        sha256=sha256, object_key=object_key, etag=etag, size=size, content_type=content_type, media_info=media_info
+    )
+    session.add(media)
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        return None
+    session.refresh(media)
+    return media
+
+def set_variants(session: Session, media: MediaObject, variants: dict, media_info: dict = None):
+    media.variants = variants
+    if media_info is not None:
+        media.media_info = media_info
+    session.commit()
+
+def get_by_key(session: Session, object_key: str):
+    return session.scalars(select(MediaObject).where(MediaObject.object_key == object_key)).first()
+
+def attach(session: Session, post: Post, media: MediaObject):
+    """Point a post at stored content and take its reference. Does not commit."""
+    post.media_sha256 = media.sha256
+    post.variants = media.variants
+    post.media_info = media.media_info
+    session.execute(
+        update(MediaObject).where(MediaObject.sha256 == media.sha256).values(ref_count=MediaObject.ref_count + 1)
+    )
+
+def attach_waiting_posts(session: Session, media: MediaObject):
+    """Attach posts that were created from this key before its content was stored (spooled uploads)."""
+    posts = session.scalars(select(Post).where(Post.media_id == media.media_id, Post.media_sha256.is_(None))).all()
+    for post in posts:
+        attach(session, post, media)
+    session.commit()
+
+def release(session: Session, post: Post):
+    """Drop a deleted post's reference; return the keys to delete from storage once nothing can use them.
+
+    Call after deleting the post, in the same transaction. Does not commit.
+    """
+    if post.media_sha256 is None:
+        return []
+    media = session.scalars(
+        select(MediaObject).where(MediaObject.sha256 == post.media_sha256).with_for_update()
+    ).first()
+    if not media:
+        return []
+    media.ref_count = max(0, media.ref_count - 1)
+    if media.ref_count > 0 or media.last_used_at >= datetime.now() - REUSE_GRACE:
+        return []
+    # The counter is what we trust, but the bytes are gone for good - check the posts themselves too
+    in_use = session.scalars(
+        select(Post.uid).where(Post.media_sha256 == media.sha256, Post.uid != post.uid).limit(1)
+    ).first()
+    if in_use:
+        return []
+    keys = list(set((media.variants or {}).values()) | {media.object_key})
+    session.delete(media)
+    return keys
@@ -0,0 +1,61 @@
+from uuid import UUID
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from models.outbox import OutboxUpload
+
+def create(session: Session, **fields):
+    item = OutboxUpload(**fields)
+    session.add(item)
+    return item
+
+def due(session: Session, host: str, limit: int):
+    return session.query(OutboxUpload).filter(
+        OutboxUpload.host == host,
+        OutboxUpload.status == 'pending',
+        OutboxUpload.next_attempt_at <= datetime.now()
+    ).order_by(OutboxUpload.next_attempt_at).limit(limit).all()
+
+def claim(session: Session, item: OutboxUpload, lease: timedelta):
+    """Push the item's next attempt out by `lease` so other workers skip it while we deliver.
+    If this worker dies, the item simply becomes due again once the lease runs out.
+    Returns when the lease ends, or None if another worker got there first."""
+    now = datetime.now()
+    # Checked against the clock, not our copy of the row - that is reloaded after every commit
+    result = session.execute(
+        update(OutboxUpload)
+        .where(OutboxUpload.uid == item.uid, OutboxUpload.status == 'pending', OutboxUpload.next_attempt_at <= now)
+        .values(next_attempt_at=now + lease)
+    )
+    session.commit()
+    return now + lease if result.rowcount else None
+
+def extend(session: Session, uid: UUID, leased_until: datetime, lease: timedelta):
+    """Renew a lease we still hold; None if it ran out and someone else claimed the item."""
+    until = datetime.now() + lease
+    result = session.execute(
+        update(OutboxUpload)
+        .where(OutboxUpload.uid == uid, OutboxUpload.status == 'pending', OutboxUpload.next_attempt_at == leased_until)
+        .values(next_attempt_at=until)
+    )
+    session.commit()
+    return until if result.rowcount else None
+
+def get(session: Session, uid: UUID):
+    return session.get(OutboxUpload, uid)
+
+def schedule_retry(session: Session, item: OutboxUpload, error: str, delay: timedelta, give_up: bool):
+    item.attempts += 1
+    item.last_error = error
+    item.next_attempt_at = datetime.now() + delay
+    if give_up:
+        item.status = 'failed'
+    session.commit()
+
+def release(session: Session, item: OutboxUpload):
+    item.next_attempt_at = datetime.now()
+    session.commit()
+
+def mark_done(session: Session, item: OutboxUpload):
+    item.status = 'done'
+    session.commit()
@@ -0,0 +1,58 @@
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.orm import Session
+from models.posts import Post
+from repository import loading
+from utils import perceptual_hash
+
+PHASH_BAND_COLUMNS = [Post.phash_band_0, Post.phash_band_1, Post.phash_band_2, Post.phash_band_3]
+
+def similar(session: Session, phash: int, max_distance: int, limit: int, exclude=None):
+    """Posts whose image is within max_distance bits of phash, nearest first, as (post, distance) pairs."""
+    # Only rows matching one band within max_distance // BANDS bits can be close enough, and
+    # each band is an indexed equality lookup - no scan over every post's hash.
+    radius = max_distance // perceptual_hash.BANDS
+    conditions = [
+        column.in_(perceptual_hash.band_neighbours(band, radius))
+        for column, band in zip(PHASH_BAND_COLUMNS, perceptual_hash.bands(phash))
+    ]
+    query = select(Post.uid, Post.phash).where(or_(*conditions))
+    if exclude is not None:
+        query = query.where(Post.uid != exclude)
+
+    distances = {}
+    for uid, candidate in session.execute(query):
+        distance = perceptual_hash.distance(candidate, phash)
+        if distance <= max_distance:
+            distances[uid] = distance
+    nearest = sorted(distances, key=distances.get)[:limit]
+    posts = session.scalars(select(Post).where(Post.uid.in_(nearest))).all() if nearest else []
+    return sorted(((post, distances[post.uid]) for post in posts), key=lambda match: match[1])
+
+def feed(session: Session, limit: int, after=None, profile=loading.FEED_CARD):
+    """Up to `limit` ready posts, newest first, strictly after the (created_at, uid) position `after`."""
+    query = select(Post).where(Post.media_status == 'ready').options(*profile)
+    if after is not None:
+        # A row-value comparison the (created_at, uid) index can seek to, so every page costs the same
+        query = query.where(tuple_(Post.created_at, Post.uid) < tuple(after))
+    return session.scalars(query.order_by(Post.created_at.desc(), Post.uid.desc()).limit(limit)).all()
+
+def by_authors(session: Session, author_ids, limit: int, after=None):
+    """(created_at, uid) of the newest ready posts by any of `author_ids`, after the keyset position `after`."""
+    query = select(Post.created_at, Post.uid).where(Post.user_id.in_(author_ids), Post.media_status == 'ready')
+    if after is not None:
+        query = query.where(tuple_(Post.created_at, Post.uid) < tuple(after))
+    return session.execute(query.order_by(Post.created_at.desc(), Post.uid.desc()).limit(limit)).all()
+
+def latest_by_author(session: Session, author_id, limit: int):
+    return session.scalars(
+        select(Post).where(Post.user_id == author_id, Post.media_status == 'ready')
+        .order_by(Post.created_at.desc(), Post.uid.desc()).limit(limit)
+    ).all()
+
+def get_many(session: Session, uids, profile=loading.FEED_CARD):
+    return session.scalars(
+        select(Post).where(Post.uid.in_(uids), Post.media_status == 'ready').options(*profile)
+    ).all()
+
+def get(session: Session, uid, profile=loading.POST_DETAIL):
+    return session.scalars(select(Post).where(Post.uid == uid, Post.media_status == 'ready').options(*profile)).first()
@@ -0,0 +1,42 @@
+from sqlalchemy import Uuid, column, func, literal_column, select, table
+from sqlalchemy.orm import Session
+from models.posts import Post
+from models.users import User
+from repository import loading
+
+# Text search configuration the search_vector columns are built with (see models)
+SEARCH_CONFIG = 'english'
+
+def fts5_query(text: str):
+    # Every word as a quoted string, so user input cannot use (or break) FTS5 query syntax; words are ANDed
+    return ' '.join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+def ranked(session: Session, model, text: str, fts_weights=()):
+    """Select of the `model` rows matching `text`, best match first.
+
+    PostgreSQL matches the GIN-indexed search_vector column; SQLite the model's FTS5 table,
+    where `fts_weights` weighs its columns (uid first) in the bm25 rank.
+    """
+    if session.get_bind().dialect.name == 'postgresql':
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, text)
+        return (
+            select(model).where(model.search_vector.bool_op('@@')(query))
+            .order_by(func.ts_rank_cd(model.search_vector, query).desc())
+        )
+    name = f'{model.__tablename__}_fts'
+    fts = table(name, column('uid', Uuid))
+    return (
+        select(model).join(fts, fts.c.uid == model.uid)
+        .where(literal_column(name).bool_op('MATCH')(fts5_query(text)))
+        # bm25() is lower for better matches
+        .order_by(func.bm25(literal_column(name), *fts_weights))
+    )
+
+def posts(session: Session, text: str, limit: int, offset: int = 0, profile=loading.FEED_CARD):
+    query = ranked(session, Post, text).where(Post.media_status == 'ready').options(*profile)
+    return session.scalars(query.order_by(Post.created_at.desc(), Post.uid.desc()).offset(offset).limit(limit)).all()
+
+def users(session: Session, text: str, limit: int, offset: int = 0):
+    # Username matches first, as the 'A' weight does on PostgreSQL
+    query = ranked(session, User, text, fts_weights=(0.0, 2.5, 1.0)).where(User.deleted == False)
+    return session.scalars(query.order_by(User.username).offset(offset).limit(limit)).all()
@@ -0,0 +1,53 @@
+from uuid import UUID
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.orm import Session
+from models.timeline import TimelineEntry
+from models.users import User
+from utils import sql
+
+def add(session: Session, user_ids, posts):
+    rows = [
+        {'user_id': user_id, 'created_at': post.created_at, 'post_id': post.uid, 'author_id': post.user_id}
+        for user_id in user_ids for post in posts
+    ]
+    if rows:
+        # Fan-out may be retried; rows that are already there are skipped instead of failing the batch
+        session.execute(sql.insert(session, TimelineEntry).on_conflict_do_nothing(), rows)
+    session.commit()
+
+def remove_author(session: Session, user_id: UUID, author_id: UUID):
+    session.execute(delete(TimelineEntry).where(TimelineEntry.user_id == user_id, TimelineEntry.author_id == author_id))
+    session.commit()
+
+def page(session: Session, user_id: UUID, limit: int, after=None):
+    """(created_at, post_id) of up to `limit` timeline entries, newest first, after the keyset position `after`."""
+    query = select(TimelineEntry.created_at, TimelineEntry.post_id).where(TimelineEntry.user_id == user_id)
+    if after is not None:
+        query = query.where(tuple_(TimelineEntry.created_at, TimelineEntry.post_id) < tuple(after))
+    return session.execute(
+        query.order_by(TimelineEntry.created_at.desc(), TimelineEntry.post_id.desc()).limit(limit)
+    ).all()
+
+def trim(session: Session, limit: int, keep: int, after: UUID = None):
+    """Keep only the `keep` newest entries of the next `limit` users by uid after `after`.
+
+    Returns the last user looked at, or None once the end of the users table is reached.
+    """
+    query = select(User.uid).order_by(User.uid).limit(limit)
+    if after is not None:
+        query = query.where(User.uid > after)
+    user_ids = session.scalars(query).all()
+    if user_ids:
+        ranked = select(
+            TimelineEntry.user_id, TimelineEntry.created_at, TimelineEntry.post_id,
+            func.row_number().over(
+                partition_by=TimelineEntry.user_id,
+                order_by=(TimelineEntry.created_at.desc(), TimelineEntry.post_id.desc())
+            ).label('position')
+        ).where(TimelineEntry.user_id.in_(user_ids)).subquery()
+        stale = select(ranked.c.user_id, ranked.c.created_at, ranked.c.post_id).where(ranked.c.position > keep)
+        session.execute(delete(TimelineEntry).where(
+            tuple_(TimelineEntry.user_id, TimelineEntry.created_at, TimelineEntry.post_id).in_(stale)
+        ))
+    session.commit()
+    return user_ids[-1] if len(user_ids) == limit else None
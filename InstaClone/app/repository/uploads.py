@@ -0,0 +1,55 @@
+from uuid import UUID
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from models.uploads import PendingUpload, ResumableUpload
+
+def create(session: Session, user_id: UUID, object_key: str, upload_id: str, content_type: str, size: int):
+    upload = ResumableUpload(
+        user_id=user_id, object_key=object_key, upload_id=upload_id, content_type=content_type, size=size, parts=[]
+    )
+    session.add(upload)
+    session.commit()
+    session.refresh(upload)
+    return upload
+
+def get(session: Session, uid: UUID, user_id: UUID):
+    """The upload, if `user_id` started it - everyone else gets the same None as for a missing one."""
+    upload = session.get(ResumableUpload, uid)
+    return upload if upload and upload.user_id == user_id else None
+
+def advance(session: Session, upload: ResumableUpload, new_offset: int, part: dict):
+    """Move the offset forward only if nobody else did since we read it - a retried chunk racing
+    the original request must not be counted twice."""
+    result = session.execute(
+        update(ResumableUpload)
+        .where(ResumableUpload.uid == upload.uid, ResumableUpload.offset == upload.offset)
+        .values(offset=new_offset, parts=upload.parts + [part])
+    )
+    session.commit()
+    if not result.rowcount:
+        return None
+    session.refresh(upload)
+    return upload
+
+def mark_completed(session: Session, upload: ResumableUpload):
+    upload.completed = True
+    session.commit()
+
+def delete(session: Session, upload: ResumableUpload):
+    session.delete(upload)
+    session.commit()
+
+def create_pending(session: Session, object_key: str, user_id: UUID, content_type: str, sha256: str):
+    session.add(PendingUpload(object_key=object_key, user_id=user_id, content_type=content_type, sha256=sha256))
+    session.commit()
+
+def get_pending(session: Session, object_key: str):
+    return session.get(PendingUpload, object_key)
+
+def claim_pending(session: Session, object_key: str, user_id: UUID):
+    """Use up a presigned upload; False if it was never issued to this user or is already confirmed."""
+    claimed = session.query(PendingUpload).filter(
+        PendingUpload.object_key == object_key, PendingUpload.user_id == user_id
+    ).delete()
+    session.commit()
+    return bool(claimed)
@@ -0,0 +1,43 @@
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from config.database import get_db
+from models.comments import Comment
+from models.posts import Post
+from models.users import User
+from repository import comments as comments_repository
+from schemas.comments import CommentBody, CommentOut, CommentPage
+from service.feed import comment_page, summary
+from utils.cursor import page_position
+from utils.tokens import get_current_user
+
+router = APIRouter(tags=['Comments'])
+
+MAX_PAGE_SIZE = 100
+
+@router.get('/posts/{uid}/comments', response_model=CommentPage, dependencies=[Depends(get_current_user)])
+def post_comments(
+    uid: UUID, after=Depends(page_position), limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    session: Session = Depends(get_db)
+):
+    if not session.get(Post, uid):
+        raise HTTPException(status_code=404, detail=f'Post with id {uid} not found.')
+    return comment_page(comments_repository.page(session, uid, limit + 1, after), limit)
+
+@router.post('/posts/{uid}/comments', response_model=CommentOut, status_code=201)
+def add_comment(
+    uid: UUID, body: CommentBody, user: User = Depends(get_current_user), session: Session = Depends(get_db)
+):
+    if not session.get(Post, uid):
+        raise HTTPException(status_code=404, detail=f'Post with id {uid} not found.')
+    comment = comments_repository.create(session, uid, user.uid, body.text)
+    return CommentOut(uid=comment.uid, text=comment.text, author=summary(user), created_at=comment.created_at)
+
+@router.delete('/comments/{uid}', status_code=204)
+def delete_comment(uid: UUID, user: User = Depends(get_current_user), session: Session = Depends(get_db)):
+    comment = session.get(Comment, uid)
+    if not comment:
+        raise HTTPException(status_code=404, detail=f'Comment with id {uid} not found.')
+    if comment.user_id != user.uid:
+        raise HTTPException(status_code=403, detail='You can only delete your own comments.')
+    comments_repository.delete_comment(session, comment)
@@ -0,0 +1,39 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+from config.database import get_db
+from models.users import User
+from repository import posts as posts_repository
+from schemas.posts import FeedPage
+from service.feed import feed_page
+from service.timeline import home_timeline
+from utils.cursor import page_position
+from utils.tokens import get_current_user
+
+router = APIRouter(prefix='/feed', tags=['Feed'])
+
+MAX_PAGE_SIZE = 50
+
+@router.get('', response_model=FeedPage)
+def home_feed(
+    request: Request, after=Depends(page_position), limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    view: Literal['grid', 'detail'] = 'grid', user: User = Depends(get_current_user), session: Session = Depends(get_db)
+):
+    # Posts by the user and the accounts they follow
+    posts = home_timeline(session, user.uid, limit + 1, after)
+    return feed_page(
+        posts, limit, view, accepts_webp='image/webp' in request.headers.get('accept', ''), session=session,
+        viewer_id=user.uid
+    )
+
+@router.get('/explore', response_model=FeedPage)
+def explore_feed(
+    request: Request, after=Depends(page_position), limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    view: Literal['grid', 'detail'] = 'grid', user: User = Depends(get_current_user), session: Session = Depends(get_db)
+):
+    # Everyone's posts, newest first
+    posts = posts_repository.feed(session, limit + 1, after)
+    return feed_page(
+        posts, limit, view, accepts_webp='image/webp' in request.headers.get('accept', ''), session=session,
+        viewer_id=user.uid
+    )
@@ -0,0 +1,29 @@
+from uuid import UUID
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.orm import Session
+from config.database import get_db
+from models.users import User
+from repository import follows as follows_repository
+from repository import timeline as timeline_repository
+from service.timeline import backfill
+from utils.tokens import get_current_user
+
+router = APIRouter(prefix='/users', tags=['Follows'])
+
+@router.post('/{uid}/follow', status_code=204)
+def follow(
+    uid: UUID, background_tasks: BackgroundTasks, user: User = Depends(get_current_user),
+    session: Session = Depends(get_db)
+):
+    if uid == user.uid:
+        raise HTTPException(status_code=400, detail='You cannot follow yourself.')
+    followee = session.get(User, uid)
+    if not followee or followee.deleted:
+        raise HTTPException(status_code=404, detail=f'User with id {uid} not found.')
+    if follows_repository.follow(session, user.uid, uid):
+        background_tasks.add_task(backfill, user.uid, uid)
+
+@router.delete('/{uid}/follow', status_code=204)
+def unfollow(uid: UUID, user: User = Depends(get_current_user), session: Session = Depends(get_db)):
+    if follows_repository.unfollow(session, user.uid, uid):
+        timeline_repository.remove_author(session, user.uid, uid)
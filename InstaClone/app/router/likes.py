@@ -0,0 +1,55 @@
+from uuid import UUID
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from config.database import get_db
+from models.comments import Comment
+from models.posts import Post
+from models.users import User
+from repository import counters as counters_repository
+from repository import likes as likes_repository
+from utils.tokens import get_current_user
+
+router = APIRouter(tags=['Likes'])
+
+# One feed page, with room to spare
+MAX_LOOKUP_IDS = 100
+
+@router.post('/posts/{uid}/like', status_code=204)
+def like_post(uid: UUID, user: User = Depends(get_current_user), session: Session = Depends(get_db)):
+    if not session.get(Post, uid):
+        raise HTTPException(status_code=404, detail=f'Post with id {uid} not found.')
+    likes_repository.like_post(session, user.uid, uid)
+
+@router.delete('/posts/{uid}/like', status_code=204)
+def unlike_post(uid: UUID, user: User = Depends(get_current_user), session: Session = Depends(get_db)):
+    likes_repository.unlike_post(session, user.uid, uid)
+
+@router.get('/posts/{uid}/likes')
+def post_likes(uid: UUID, session: Session = Depends(get_db)):
+    return {'likes': counters_repository.post_like_counts(session, [uid]).get(uid, 0)}
+
+@router.post('/comments/{uid}/like', status_code=204)
+def like_comment(uid: UUID, user: User = Depends(get_current_user), session: Session = Depends(get_db)):
+    if not session.get(Comment, uid):
+        raise HTTPException(status_code=404, detail=f'Comment with id {uid} not found.')
+    likes_repository.like_comment(session, user.uid, uid)
+
+@router.delete('/comments/{uid}/like', status_code=204)
+def unlike_comment(uid: UUID, user: User = Depends(get_current_user), session: Session = Depends(get_db)):
+    likes_repository.unlike_comment(session, user.uid, uid)
+
+@router.get('/posts/liked')
+def liked_posts(
+    ids: List[UUID] = Query(..., max_length=MAX_LOOKUP_IDS), user: User = Depends(get_current_user),
+    session: Session = Depends(get_db)
+):
+    """Which of `ids` the viewer has liked, e.g. ?ids=<uid>&ids=<uid> for a page of posts."""
+    return {'liked': likes_repository.liked_post_ids(session, user.uid, ids)}
+
+@router.get('/comments/liked')
+def liked_comments(
+    ids: List[UUID] = Query(..., max_length=MAX_LOOKUP_IDS), user: User = Depends(get_current_user),
+    session: Session = Depends(get_db)
+):
+    return {'liked': likes_repository.liked_comment_ids(session, user.uid, ids)}
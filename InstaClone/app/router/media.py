@@ -0,0 +1,139 @@
+import os
+from typing import Literal
+from uuid import UUID
+from botocore.exceptions import ClientError
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from models.posts import Post
+from config.database import get_db
+from config.minio import presigned_url, presigned_urls
+from config.storage import media_cache, storage
+from service.feed import media_for
+from repository import posts as posts_repository
+from utils.http import RangeNotSatisfiable, parse_range, is_not_modified, http_date
+from utils.tokens import get_current_user
+
+router = APIRouter(tags=['Media'])
+
+STREAM_CHUNK_SIZE = 64 * 1024
+CACHE_CONTROL = 'private, max-age=86400'
+
+# dHash distances above ~10 bits stop meaning 'the same picture'
+MAX_SIMILARITY_DISTANCE = 10
+
+@router.get('/posts/{uid}/media')
+def post_media(uid: UUID, request: Request, view: Literal['grid', 'detail'] = 'detail', session: Session = Depends(get_db)):
+    post = session.get(Post, uid)
+    if not post:
+        raise HTTPException(status_code=404, detail=f'Post with id {uid} not found.')
+    if post.media_status != 'ready':
+        return {'media_status': post.media_status, 'variant': None, 'url': None}
+    name, object_key = media_for(post, view, accepts_webp='image/webp' in request.headers.get('accept', ''))
+    return {'media_status': post.media_status, 'variant': name, 'url': presigned_url(object_key), 'media_info': post.media_info}
+
+@router.get('/posts/{uid}/similar')
+def similar_posts(
+    uid: UUID, max_distance: int = Query(6, ge=0, le=MAX_SIMILARITY_DISTANCE), limit: int = Query(20, ge=1, le=100),
+    session: Session = Depends(get_db)
+):
+    post = session.get(Post, uid)
+    if not post:
+        raise HTTPException(status_code=404, detail=f'Post with id {uid} not found.')
+    if post.phash is None:
+        return []
+    matches = posts_repository.similar(session, post.phash, max_distance, limit, exclude=post.uid)
+    # Stored file_urls expire; sign what the feed would show, in one batch
+    media = {match.uid: media_for(match, 'grid', False) for match, _ in matches}
+    urls = presigned_urls({object_key for _, object_key in media.values()})
+    return [{'post_id': match.uid, 'distance': distance, 'url': urls[media[match.uid][1]]} for match, distance in matches]
+
+@router.get('/media/{object_key:path}', dependencies=[Depends(get_current_user)])
+async def stream_media(object_key: str, request: Request):
+    if not object_key.startswith('posts/'):
+        raise HTTPException(status_code=404, detail='Media not found.')
+    cached = await run_in_threadpool(media_cache.get, object_key)
+    if cached:
+        return cached_media(cached, request)
+    try:
+        head = await storage.head_object(object_key)
+    except ClientError:
+        raise HTTPException(status_code=404, detail='Media not found.')
+
+    size = head['ContentLength']
+    headers = {
+        'ETag': head['ETag'],
+        'Last-Modified': http_date(head['LastModified']),
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': CACHE_CONTROL,
+    }
+    if is_not_modified(request.headers, head['ETag'], head['LastModified']):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    if_range = request.headers.get('if-range')
+    if not if_range or if_range == head['ETag']:
+        try:
+            byte_range = parse_range(request.headers.get('range'), size)
+        except RangeNotSatisfiable:
+            return Response(status_code=416, headers={**headers, 'Content-Range': f'bytes */{size}'})
+
+    if byte_range:
+        start, end = byte_range
+        response = await storage.get_object(object_key, f'bytes={start}-{end}')
+        headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+        status_code = 206
+    else:
+        response = await storage.get_object(object_key)
+        status_code = 200
+    headers['Content-Length'] = str(response['ContentLength'])
+
+    # botocore's body is a blocking stream; read it off the event loop one chunk at a time
+    chunks = response['Body'].iter_chunks(STREAM_CHUNK_SIZE)
+    if status_code == 200 and media_cache.admit(object_key, size):
+        body = stream_into_cache(chunks, object_key, head)
+    else:
+        body = iterate_in_threadpool(chunks)
+    return StreamingResponse(
+        close_when_done(body, response['Body']), status_code=status_code, media_type=head['ContentType'], headers=headers
+    )
+
+async def close_when_done(body, stream):
+    # However the response ends - including the client going away mid-body - hand the
+    # MinIO connection back instead of leaving it checked out until garbage collection
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        try:
+            await body.aclose()
+        finally:
+            stream.close()
+
+def cached_media(cached, request):
+    headers = {'ETag': cached.etag, 'Last-Modified': http_date(cached.last_modified), 'Cache-Control': CACHE_CONTROL}
+    if is_not_modified(request.headers, cached.etag, cached.last_modified):
+        return Response(status_code=304, headers={**headers, 'Accept-Ranges': 'bytes'})
+    # FileResponse answers Range/If-Range itself and hands the whole file to the server as a
+    # zero-copy pathsend where the ASGI server supports it
+    return FileResponse(cached.path, headers=headers, media_type=cached.content_type, stat_result=cached.stat)
+
+def copy_chunks(chunks, file):
+    # Written in the same worker thread that reads from MinIO, so caching costs no extra hops
+    for chunk in chunks:
+        file.write(chunk)
+        yield chunk
+
+async def stream_into_cache(chunks, object_key, head):
+    file, path = await run_in_threadpool(media_cache.temporary_file)
+    try:
+        async for chunk in iterate_in_threadpool(copy_chunks(chunks, file)):
+            yield chunk
+    except BaseException:
+        # Client went away or MinIO failed mid-body: never cache a partial object
+        file.close()
+        os.remove(path)
+        raise
+    file.close()
+    await run_in_threadpool(media_cache.put, object_key, path, head['ETag'], head['LastModified'], head['ContentType'])
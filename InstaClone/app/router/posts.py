@@ -0,0 +1,29 @@
+from uuid import UUID
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+from config.database import get_db
+from models.users import User
+from repository import comments as comments_repository
+from repository import posts as posts_repository
+from schemas.posts import PostDetail
+from service.feed import post_detail
+from utils.tokens import get_current_user
+
+router = APIRouter(prefix='/posts', tags=['Posts'])
+
+COMMENTS_PREVIEW = 20
+
+@router.get('/{uid}', response_model=PostDetail)
+def get_post(
+    uid: UUID, request: Request, view: Literal['grid', 'detail'] = 'detail', user: User = Depends(get_current_user),
+    session: Session = Depends(get_db)
+):
+    post = posts_repository.get(session, uid)
+    if not post:
+        raise HTTPException(status_code=404, detail=f'Post with id {uid} not found.')
+    comments = comments_repository.page(session, uid, COMMENTS_PREVIEW + 1)
+    return post_detail(
+        post, comments, COMMENTS_PREVIEW, view, accepts_webp='image/webp' in request.headers.get('accept', ''), session=session,
+        viewer_id=user.uid
+    )
@@ -0,0 +1,50 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+from config.database import get_db
+from models.users import User
+from repository import search as search_repository
+from schemas.search import PostResults, UserResults
+from schemas.users import UserResult
+from service.feed import feed_cards
+from utils.tokens import get_current_user
+
+router = APIRouter(prefix='/search', tags=['Search'])
+
+MAX_PAGE_SIZE = 50
+# Ranked results have no stable keyset to page on, so pages are offsets - and nobody reads this far
+MAX_OFFSET = 1000
+
+def search_text(q: str = Query(max_length=200)):
+    if not q.strip():
+        raise HTTPException(status_code=400, detail='Search query is empty.')
+    return q
+
+@router.get('/posts', response_model=PostResults)
+def search_posts(
+    request: Request, q: str = Depends(search_text), offset: int = Query(0, ge=0, le=MAX_OFFSET),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE), view: Literal['grid', 'detail'] = 'grid',
+    user: User = Depends(get_current_user), session: Session = Depends(get_db)
+):
+    posts = search_repository.posts(session, q, limit + 1, offset)
+    return PostResults(
+        posts=feed_cards(
+            posts[:limit], view, accepts_webp='image/webp' in request.headers.get('accept', ''), session=session,
+            viewer_id=user.uid
+        ),
+        next_offset=offset + limit if len(posts) > limit else None
+    )
+
+@router.get('/users', response_model=UserResults, dependencies=[Depends(get_current_user)])
+def search_users(
+    q: str = Depends(search_text), offset: int = Query(0, ge=0, le=MAX_OFFSET),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE), session: Session = Depends(get_db)
+):
+    users = search_repository.users(session, q, limit + 1, offset)
+    return UserResults(
+        users=[
+            UserResult(uid=found.uid, username=found.username, bio=found.bio, followers_count=found.followers_count)
+            for found in users[:limit]
+        ],
+        next_offset=offset + limit if len(users) > limit else None
+    )
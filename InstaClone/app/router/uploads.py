@@ -0,0 +1,176 @@
+from botocore.exceptions import ClientError
+from uuid import UUID
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Header, Request, Response
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from schemas.uploads import PresignIn, ConfirmIn, ResumableIn
+from models.posts import Post
+from models.users import User
+from config.database import get_db
+from config.minio import presigned_post, presigned_url, sha256_checksum
+from config.storage import storage
+from service.uploads import (
+    MAX_UPLOAD_BYTES, PART_SIZE, StoredObject, new_object_key, register_assembled, register_media
+)
+from service.metadata import describe_object
+from service.timeline import fan_out
+from repository import media as media_repository
+from repository import uploads as uploads_repository
+from utils.sniff import SNIFF_BYTES, sniff_media_type
+from utils.tokens import get_current_user
+
+router = APIRouter(prefix='/uploads', tags=['Uploads'])
+
+def matches_declared_type(first_bytes, content_type):
+    detected = sniff_media_type(first_bytes)
+    return detected is not None and detected.split('/')[0] == content_type.split('/')[0]
+
+@router.post('/presign')
+def presign_upload(request: PresignIn, user: User = Depends(get_current_user), session: Session = Depends(get_db)):
+    media_type = request.content_type.split('/')[0]
+    if media_type not in MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=400, detail="Unsupported File uploaded. Please upload image or video file!")
+    object_key = new_object_key(request.filename)
+    policy = presigned_post(object_key, request.content_type, MAX_UPLOAD_BYTES[media_type], request.sha256)
+    # Only the user we handed the policy to may turn the object into a post, and only once
+    uploads_repository.create_pending(session, object_key, user.uid, request.content_type, request.sha256)
+    return {'key': object_key, 'url': policy['url'], 'fields': policy['fields']}
+
+@router.post('/confirm')
+async def confirm_upload(
+    request: ConfirmIn, background_tasks: BackgroundTasks, user: User = Depends(get_current_user),
+    session: Session = Depends(get_db)
+):
+    pending = await run_in_threadpool(uploads_repository.get_pending, session, request.key)
+    if not pending or pending.user_id != user.uid:
+        raise HTTPException(status_code=404, detail='Upload not found. Request an upload URL first.')
+    sha256 = pending.sha256
+    try:
+        head = await storage.head_object(request.key, checksum=True)
+    except ClientError:
+        raise HTTPException(status_code=404, detail='Upload not found. Upload the file before confirming it.')
+    if not await run_in_threadpool(uploads_repository.claim_pending, session, request.key, user.uid):
+        raise HTTPException(status_code=409, detail='Upload was already confirmed.')
+    if head['ContentType'].split('/')[0] not in MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=400, detail="Unsupported File uploaded. Please upload image or video file!")
+    # The POST policy pins the declared type, but only the bytes say what was really uploaded
+    first_bytes = await storage.read_range(request.key, 0, SNIFF_BYTES - 1)
+    if not matches_declared_type(first_bytes, head['ContentType']):
+        await storage.delete_object(request.key)
+        raise HTTPException(status_code=415, detail=f"File content does not match {head['ContentType']}.")
+
+    # Storage verified the bytes against the digest the policy pinned, so it doubles as our dedupe key
+    # without the API ever reading the object. No checksum back means it was never checked.
+    if head.get('ChecksumSHA256') != sha256_checksum(sha256):
+        await storage.delete_object(request.key)
+        raise HTTPException(status_code=400, detail='Upload checksum does not match the declared SHA-256.')
+
+    # Registered like any other upload, so it is deduplicated and reference counted too
+    stored = StoredObject(key=request.key, etag=head['ETag'].strip('"'), size=head['ContentLength'], sha256=sha256)
+    media_info = await describe_object(request.key, stored.size)
+    media, _ = await register_media(session, stored, head['ContentType'], media_info)
+    new_post = Post(file_url=presigned_url(media.object_key), caption=request.caption, user_id=user.uid)
+
+    def save():
+        media_repository.attach(session, new_post, media)
+        session.add(new_post)
+        session.commit()
+        session.refresh(new_post)
+        return new_post
+
+    new_post = await run_in_threadpool(save)
+    background_tasks.add_task(fan_out, new_post.uid)
+    return new_post
+
+# Resumable uploads, loosely following tus: every PATCH carries exactly one multipart part,
+# so a dropped connection costs at most one part and the client resumes from Upload-Offset.
+
+@router.post('/resumable', status_code=201)
+async def start_resumable_upload(
+    request: ResumableIn, response: Response, user: User = Depends(get_current_user), session: Session = Depends(get_db)
+):
+    media_type = request.content_type.split('/')[0]
+    if media_type not in MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=400, detail="Unsupported File uploaded. Please upload image or video file!")
+    if not 0 < request.size <= MAX_UPLOAD_BYTES[media_type]:
+        raise HTTPException(status_code=413, detail=f'File size must be between 1 and {MAX_UPLOAD_BYTES[media_type]} bytes.')
+    object_key = new_object_key(request.filename)
+    upload_id = await storage.create_multipart_upload(object_key, request.content_type)
+    upload = await run_in_threadpool(
+        uploads_repository.create, session, user.uid, object_key, upload_id, request.content_type, request.size
+    )
+    response.headers['Location'] = f'/uploads/resumable/{upload.uid}'
+    return {'uid': upload.uid, 'key': object_key, 'part_size': PART_SIZE, 'offset': 0}
+
+@router.head('/resumable/{uid}')
+def resumable_upload_offset(uid: UUID, user: User = Depends(get_current_user), session: Session = Depends(get_db)):
+    upload = uploads_repository.get(session, uid, user.uid)
+    if not upload:
+        raise HTTPException(status_code=404, detail=f'Upload with id {uid} not found.')
+    return Response(headers={
+        'Upload-Offset': str(upload.offset), 'Upload-Length': str(upload.size), 'Cache-Control': 'no-store'
+    })
+
+@router.patch('/resumable/{uid}', status_code=204)
+async def upload_resumable_chunk(
+    uid: UUID, request: Request, background_tasks: BackgroundTasks, upload_offset: int = Header(...),
+    user: User = Depends(get_current_user), session: Session = Depends(get_db)
+):
+    upload = await run_in_threadpool(uploads_repository.get, session, uid, user.uid)
+    if not upload:
+        raise HTTPException(status_code=404, detail=f'Upload with id {uid} not found.')
+    if upload.completed or upload_offset != upload.offset:
+        raise HTTPException(status_code=409, detail='Offset mismatch.', headers={'Upload-Offset': str(upload.offset)})
+
+    if upload.offset == upload.size:
+        # Every byte is in but completing failed last time: only retry that, never take another part
+        async for data in request.stream():
+            if data:
+                raise HTTPException(status_code=400, detail='Upload is fully received, send an empty request to finish it.')
+        await complete_resumable(session, upload, background_tasks)
+        return Response(status_code=204, headers={'Upload-Offset': str(upload.offset)})
+
+    expected = min(PART_SIZE, upload.size - upload.offset)
+    chunk = bytearray()
+    async for data in request.stream():
+        chunk += data
+        if len(chunk) > expected:
+            raise HTTPException(status_code=413, detail=f'Chunk must be exactly {expected} bytes.')
+    if len(chunk) != expected:
+        raise HTTPException(status_code=400, detail=f'Chunk must be exactly {expected} bytes.')
+
+    if upload.offset == 0 and not matches_declared_type(bytes(chunk[:SNIFF_BYTES]), upload.content_type):
+        raise HTTPException(status_code=415, detail=f'File content does not match {upload.content_type}.')
+
+    part_number = upload.offset // PART_SIZE + 1
+    etag = await storage.upload_part(upload.object_key, upload.upload_id, part_number, bytes(chunk))
+    upload = await run_in_threadpool(
+        uploads_repository.advance, session, upload, upload.offset + len(chunk), {'PartNumber': part_number, 'ETag': etag}
+    )
+    if not upload:
+        raise HTTPException(status_code=409, detail='Chunk was uploaded concurrently, check the offset and retry.')
+
+    if upload.offset == upload.size:
+        await complete_resumable(session, upload, background_tasks)
+    return Response(status_code=204, headers={'Upload-Offset': str(upload.offset)})
+
+async def complete_resumable(session: Session, upload, background_tasks: BackgroundTasks):
+    try:
+        await storage.complete_multipart_upload(upload.object_key, upload.upload_id, upload.parts)
+    except ClientError as error:
+        # Already completed by an earlier attempt that failed before it could record it
+        if error.response.get('Error', {}).get('Code') != 'NoSuchUpload':
+            raise
+        await storage.head_object(upload.object_key)
+    await run_in_threadpool(uploads_repository.mark_completed, session, upload)
+    # Hashing reads the whole object back, so it happens after the response
+    background_tasks.add_task(register_assembled, upload.object_key, upload.content_type)
+
+@router.delete('/resumable/{uid}', status_code=204)
+async def cancel_resumable_upload(uid: UUID, user: User = Depends(get_current_user), session: Session = Depends(get_db)):
+    upload = await run_in_threadpool(uploads_repository.get, session, uid, user.uid)
+    if not upload:
+        raise HTTPException(status_code=404, detail=f'Upload with id {uid} not found.')
+    if not upload.completed:
+        await storage.abort_multipart_upload(upload.object_key, upload.upload_id)
+    await run_in_threadpool(uploads_repository.delete, session, upload)
@@ -1,6 +1,22 @@
-from pydantic import BaseModel, UUID4
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, UUID4
+from schemas.users import UserSummary
 
 class CommentIn(BaseModel):
     text: str
     post_id: UUID4
-    user_id: UUID4
\ No newline at end of file
+    user_id: UUID4
+
+class CommentBody(BaseModel):
+    text: str = Field(min_length=1, max_length=2200)
+
+class CommentOut(BaseModel):
+    uid: UUID4
+    text: str
+    author: UserSummary
+    created_at: datetime
+
+class CommentPage(BaseModel):
+    comments: List[CommentOut]
+    next_cursor: Optional[str]
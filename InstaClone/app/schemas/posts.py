@@ -1,6 +1,31 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, UUID4
+from schemas.comments import CommentPage
+from schemas.users import UserSummary
 
 class PostIn(BaseModel):
     file_url: str
     caption: str
-    user_id: UUID4
\ No newline at end of file
+    user_id: UUID4
+
+class FeedPost(BaseModel):
+    uid: UUID4
+    user_id: UUID4
+    author: UserSummary
+    caption: Optional[str]
+    url: str
+    variant: str
+    media_info: Optional[Dict[str, Any]]
+    created_at: datetime
+    likes: int = 0
+    comments_count: int = 0
+    liked_by_me: bool = False
+
+class PostDetail(FeedPost):
+    # First page of the thread; later pages come from GET /posts/{uid}/comments
+    comments: CommentPage
+
+class FeedPage(BaseModel):
+    posts: List[FeedPost]
+    next_cursor: Optional[str]
@@ -0,0 +1,12 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from schemas.posts import FeedPost
+from schemas.users import UserResult
+
+class PostResults(BaseModel):
+    posts: List[FeedPost]
+    next_offset: Optional[int]
+
+class UserResults(BaseModel):
+    users: List[UserResult]
+    next_offset: Optional[int]
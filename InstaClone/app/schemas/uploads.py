@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+
+class PresignIn(BaseModel):
+    filename: str
+    content_type: str
+    # Hex SHA-256 of the file; storage checks the upload against it
+    sha256: str = Field(pattern='^[0-9a-f]{64}$')
+
+class ConfirmIn(BaseModel):
+    key: str
+    caption: str
+
+class ResumableIn(BaseModel):
+    filename: str
+    content_type: str
+    size: int
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, UUID4
 
 class UserIn(BaseModel):
     email: str
@@ -8,4 +8,12 @@ class UserIn(BaseModel):
     last_name: str
     age: int
     gender: str
-    bio: str
\ No newline at end of file
+    bio: str
+
+class UserSummary(BaseModel):
+    uid: UUID4
+    username: str
+
+class UserResult(UserSummary):
+    bio: str
+    followers_count: int
@@ -0,0 +1,56 @@
+import os
+import asyncio
+import logging
+from starlette.concurrency import run_in_threadpool
+from config.database import SessionLocal
+from repository import comments as comments_repository
+from repository import counters as counters_repository
+from utils import sql
+
+logger = logging.getLogger(__name__)
+
+COMPACT_INTERVAL = float(os.getenv('LIKE_COUNTER_COMPACT_INTERVAL', 60))
+COMPACT_BATCH_SIZE = int(os.getenv('LIKE_COUNTER_COMPACT_BATCH_SIZE', 500))
+# Advisory lock id; every worker runs the loop, but only the lock holder compacts
+COMPACT_LOCK_ID = 0x6C696B6573
+RECOUNT_LOCK_ID = 0x636F6D6D656E7473
+# Posts whose comments_count is checked per pass; the whole table is covered over successive passes
+RECOUNT_BATCH_SIZE = int(os.getenv('COMMENT_RECOUNT_BATCH_SIZE', 1000))
+
+# Where the comment recount sweep resumes; None starts from the first post again
+recount_after = None
+
+def compact_once():
+    session = SessionLocal()
+    try:
+        with sql.advisory_lock(session, COMPACT_LOCK_ID) as acquired:
+            if not acquired:
+                return 0
+            post_ids = counters_repository.sharded_posts(session, COMPACT_BATCH_SIZE)
+            for post_id in post_ids:
+                counters_repository.compact_post_likes(session, post_id)
+            return len(post_ids)
+    finally:
+        session.close()
+
+def recount_once():
+    global recount_after
+    session = SessionLocal()
+    try:
+        with sql.advisory_lock(session, RECOUNT_LOCK_ID) as acquired:
+            if acquired:
+                recount_after = comments_repository.recount(session, RECOUNT_BATCH_SIZE, recount_after)
+    finally:
+        session.close()
+
+async def run_compactor():
+    while True:
+        try:
+            await run_in_threadpool(compact_once)
+        except Exception:
+            logger.exception('Like counter compaction failed')
+        try:
+            await run_in_threadpool(recount_once)
+        except Exception:
+            logger.exception('Comment recount failed')
+        await asyncio.sleep(COMPACT_INTERVAL)
@@ -0,0 +1,99 @@
+import os
+import asyncio
+import multiprocessing
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from utils import blurhash, perceptual_hash
+
+THUMBNAIL_SIZE = 150
+WIDTHS = (320, 640, 1080)
+WEBP_WIDTH = 1080
+# Blurhash cost grows with pixels x components, and a tiny copy blurs just the same
+BLURHASH_SIZE = 32
+BLURHASH_COMPONENTS = (4, 3)
+
+# Which variants serve each view, best first; 'original' is always there as a last resort
+VIEW_VARIANTS = {
+    'grid': ['thumb', 'w320', 'w640'],
+    'detail': ['w1080', 'w640'],
+}
+
+# CPU-bound rendering only; storage I/O stays in the parent, behind the storage circuit breaker.
+# Spawned rather than forked so workers never inherit the parent's threads and connection pools.
+_pool = ProcessPoolExecutor(
+    max_workers=int(os.getenv('DERIVATIVE_WORKERS', 2)),
+    mp_context=multiprocessing.get_context('spawn')
+)
+
+def derivative_key(object_key, name, extension):
+    stem = object_key.rsplit('.', 1)[0]
+    return f'{stem}_{name}.{extension}'
+
+def encode(image, image_format, **options):
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+def load_image(data):
+    from PIL import Image, ImageOps
+
+    with Image.open(BytesIO(data)) as source:
+        return ImageOps.exif_transpose(source).convert('RGB')
+
+def describe_image(image):
+    """Display size (after EXIF rotation), a blurhash placeholder and a perceptual hash."""
+    from PIL import Image, ImageOps
+
+    small = ImageOps.contain(image, (BLURHASH_SIZE, BLURHASH_SIZE))
+    gray = image.convert('L').resize((perceptual_hash.HASH_SIZE + 1, perceptual_hash.HASH_SIZE), Image.LANCZOS)
+    return {
+        'width': image.width, 'height': image.height,
+        'blurhash': blurhash.encode(small.tobytes(), small.width, small.height, *BLURHASH_COMPONENTS),
+        # Hex, because JSON clients cannot hold a 64-bit integer exactly
+        'phash': f'{perceptual_hash.difference_hash(gray.tobytes()):016x}'
+    }
+
+def render_derivatives(image):
+    """Return {name: (bytes, extension, content_type)} for a decoded RGB image."""
+    from PIL import Image, ImageOps
+
+    rendered = {
+        'thumb': (encode(ImageOps.fit(image, (THUMBNAIL_SIZE, THUMBNAIL_SIZE)), 'JPEG', quality=80), 'jpg', 'image/jpeg')
+    }
+    for width in WIDTHS:
+        # Never upscale - the original already covers anything wider than itself
+        if width < image.width:
+            resized = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+            rendered[f'w{width}'] = (encode(resized, 'JPEG', quality=82, optimize=True, progressive=True), 'jpg', 'image/jpeg')
+    webp_width = min(WEBP_WIDTH, image.width)
+    webp = image.resize((webp_width, round(image.height * webp_width / image.width)), Image.LANCZOS)
+    rendered['webp'] = (encode(webp, 'WEBP', quality=80, method=4), 'webp', 'image/webp')
+    return rendered
+
+def process_image(data):
+    # Runs inside a pool worker: decode once, then render and describe from the same image
+    image = load_image(data)
+    return render_derivatives(image), describe_image(image)
+
+async def create_derivatives(object_key):
+    """Render and store the siblings of an image; return (variants, metadata)."""
+    # Imported here so the spawned workers, which import this module, never build a storage client
+    from config.storage import storage
+
+    loop = asyncio.get_running_loop()
+    rendered, info = await loop.run_in_executor(_pool, process_image, await storage.read(object_key))
+    variants = {'original': object_key}
+    for name, (body, extension, content_type) in rendered.items():
+        variants[name] = derivative_key(object_key, name, extension)
+    await asyncio.gather(*(
+        storage.put_object(variants[name], body, content_type) for name, (body, _, content_type) in rendered.items()
+    ))
+    return variants, info
+
+def pick_variant(variants, view, accepts_webp=False):
+    if accepts_webp and view == 'detail' and 'webp' in variants:
+        return 'webp', variants['webp']
+    for name in VIEW_VARIANTS[view]:
+        if name in variants:
+            return name, variants[name]
+    return 'original', variants['original']
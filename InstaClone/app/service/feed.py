@@ -0,0 +1,62 @@
+from sqlalchemy.orm import Session
+from config.minio import object_key_from_url, presigned_urls
+from repository import counters as counters_repository
+from repository import likes as likes_repository
+from schemas.comments import CommentOut, CommentPage
+from schemas.posts import FeedPage, FeedPost, PostDetail
+from schemas.users import UserSummary
+from service.derivatives import pick_variant
+from utils.cursor import encode_cursor
+
+def media_for(post, view, accepts_webp):
+    if post.variants:
+        return pick_variant(post.variants, view, accepts_webp)
+    return 'original', object_key_from_url(post.file_url)
+
+def feed_cards(posts, view, accepts_webp=False, session: Session = None, viewer_id=None):
+    """FeedPost cards for posts loaded with at least the FEED_CARD profile."""
+    # Whole page in one lookup each rather than queries per post
+    post_ids = [post.uid for post in posts]
+    liked = likes_repository.liked_post_ids(session, viewer_id, post_ids) if viewer_id else set()
+    likes = counters_repository.post_like_counts(session, post_ids) if session else {}
+    media = {post.uid: media_for(post, view, accepts_webp) for post in posts}
+    # One batch signing pass for the whole page instead of a signature per post
+    urls = presigned_urls(list({object_key for _, object_key in media.values()}))
+    return [
+        FeedPost(
+            uid=post.uid, user_id=post.user_id, author=summary(post.posted_by), caption=post.caption,
+            url=urls[media[post.uid][1]], variant=media[post.uid][0], media_info=post.media_info,
+            created_at=post.created_at, likes=likes.get(post.uid, 0), comments_count=post.comments_count,
+            liked_by_me=post.uid in liked
+        )
+        for post in posts
+    ]
+
+def feed_page(posts, limit, view, accepts_webp=False, session: Session = None, viewer_id=None):
+    """Build a page from up to `limit + 1` posts; the extra one only tells us whether a next page exists."""
+    page = posts[:limit]
+    return FeedPage(
+        posts=feed_cards(page, view, accepts_webp, session, viewer_id),
+        next_cursor=encode_cursor(page[-1].created_at, page[-1].uid) if len(posts) > limit else None
+    )
+
+def post_detail(post, comments, comments_limit, view, accepts_webp=False, session: Session = None, viewer_id=None):
+    """PostDetail for a post loaded with the POST_DETAIL profile and up to `comments_limit + 1` of its comments."""
+    card = feed_cards([post], view, accepts_webp, session, viewer_id)[0]
+    return PostDetail(**card.model_dump(), comments=comment_page(comments, comments_limit))
+
+def comment_page(comments, limit):
+    """Build a page from up to `limit + 1` comments loaded with the COMMENT profile."""
+    page = comments[:limit]
+    return CommentPage(
+        comments=[
+            CommentOut(
+                uid=comment.uid, text=comment.text, author=summary(comment.commented_by), created_at=comment.created_at
+            )
+            for comment in page
+        ],
+        next_cursor=encode_cursor(page[-1].created_at, page[-1].uid) if len(comments) > limit else None
+    )
+
+def summary(user):
+    return UserSummary(uid=user.uid, username=user.username)
@@ -0,0 +1,135 @@
+"""Orphaned media garbage collector.
+
+Deletes objects under posts/ that no post references once they are older than the
+grace period, forgets presigned uploads that were never confirmed, aborts resumable
+uploads that were abandoned part way, and prunes the legacy local static/ copies. Run from InstaClone/app:
+
+    python -m service.gc --grace-hours 24 [--dry-run]
+"""
+import os
+import time
+import argparse
+from botocore.exceptions import ClientError
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, delete, func
+from sqlalchemy.orm import Session
+from models.posts import Post
+from models.media import MediaObject
+from models.uploads import PendingUpload, ResumableUpload
+from config.database import SessionLocal
+from config.minio import s3_client, MY_BUCKET
+from utils.media_keys import media_id
+
+GC_PREFIX = 'posts/'
+STATIC_DIR = os.getenv('STATIC_DIR', 'static')
+# DeleteObjects accepts at most 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+
+def referenced_ids(session: Session, ids, used_since):
+    """Ids still in use: referenced by a post, or handed out again by deduplication recently."""
+    if not ids:
+        return set()
+    posted = session.scalars(select(Post.media_id).where(Post.media_id.in_(ids)))
+    reused = session.scalars(
+        select(MediaObject.media_id).where(MediaObject.media_id.in_(ids), MediaObject.last_used_at >= used_since)
+    )
+    return set(posted) | set(reused)
+
+def delete_batch(session: Session, keys, stats):
+    response = s3_client.delete_objects(
+        Bucket=MY_BUCKET, Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True}
+    )
+    failed = {error['Key'] for error in response.get('Errors', [])}
+    deleted = [key for key in keys if key not in failed]
+    # Forget deleted originals so deduplication never hands out a key that is gone
+    session.execute(delete(MediaObject).where(MediaObject.object_key.in_(deleted)))
+    session.commit()
+    stats['deleted'] += len(deleted)
+    stats['failed'] += len(failed)
+
+def collect_orphans(grace: timedelta, dry_run=False):
+    cutoff = datetime.now(timezone.utc) - grace
+    stats = {'scanned': 0, 'orphaned': 0, 'deleted': 0, 'failed': 0}
+    pending = []
+    session = SessionLocal()
+    try:
+        paginator = s3_client.get_paginator('list_objects_v2')
+        # Each listing page (<= 1000 keys) costs one indexed IN query, so memory stays bounded
+        for page in paginator.paginate(Bucket=MY_BUCKET, Prefix=GC_PREFIX, PaginationConfig={'PageSize': 1000}):
+            objects = page.get('Contents', [])
+            stats['scanned'] += len(objects)
+            candidates = [obj for obj in objects if obj['LastModified'] < cutoff and media_id(obj['Key'])]
+            referenced = referenced_ids(session, {media_id(obj['Key']) for obj in candidates}, datetime.now() - grace)
+            orphans = [obj['Key'] for obj in candidates if media_id(obj['Key']) not in referenced]
+            stats['orphaned'] += len(orphans)
+            if dry_run:
+                continue
+            pending.extend(orphans)
+            while len(pending) >= DELETE_BATCH_SIZE:
+                delete_batch(session, pending[:DELETE_BATCH_SIZE], stats)
+                pending = pending[DELETE_BATCH_SIZE:]
+        if pending:
+            delete_batch(session, pending, stats)
+    finally:
+        session.close()
+    return stats
+
+def prune_pending(grace: timedelta, dry_run=False):
+    # Presigned uploads nobody confirmed; their objects, if any, are orphans and go with collect_orphans
+    session = SessionLocal()
+    try:
+        stale = PendingUpload.created_at < datetime.now() - grace
+        if dry_run:
+            return session.scalar(select(func.count()).select_from(PendingUpload).where(stale))
+        removed = session.execute(delete(PendingUpload).where(stale)).rowcount
+        session.commit()
+        return removed
+    finally:
+        session.close()
+
+def abort_resumable(grace: timedelta, dry_run=False):
+    """Abort multipart uploads nobody finished, so their parts stop taking space, and forget old uploads."""
+    session = SessionLocal()
+    try:
+        cutoff = datetime.now() - grace
+        stale = session.scalars(select(ResumableUpload).where(ResumableUpload.created_at < cutoff)).all()
+        if dry_run:
+            return len(stale)
+        for upload in stale:
+            if not upload.completed:
+                try:
+                    s3_client.abort_multipart_upload(Bucket=MY_BUCKET, Key=upload.object_key, UploadId=upload.upload_id)
+                except ClientError as error:
+                    # Completed or aborted by a request that never got to record it
+                    if error.response.get('Error', {}).get('Code') != 'NoSuchUpload':
+                        raise
+            session.delete(upload)
+            session.commit()
+        return len(stale)
+    finally:
+        session.close()
+
+def prune_static(grace: timedelta, dry_run=False, directory=STATIC_DIR):
+    # /image used to keep a local copy of every upload here; nothing reads them any more
+    removed = 0
+    if not os.path.isdir(directory):
+        return removed
+    cutoff = time.time() - grace.total_seconds()
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                if not dry_run:
+                    os.remove(entry.path)
+                removed += 1
+    return removed
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Delete media objects that no post references.')
+    parser.add_argument('--grace-hours', type=float, default=24)
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+    grace = timedelta(hours=args.grace_hours)
+    print(collect_orphans(grace, args.dry_run))
+    print({'pending_removed': prune_pending(grace, args.dry_run)})
+    print({'resumable_removed': abort_resumable(grace, args.dry_run)})
+    print({'static_removed': prune_static(grace, args.dry_run)})
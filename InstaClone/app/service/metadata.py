@@ -0,0 +1,37 @@
+from fastapi import UploadFile
+from config.storage import storage
+from utils import mp4
+from utils.sniff import SNIFF_BYTES, ISO_BMFF_BRANDS, sniff_media_type
+
+# Types laid out as ISO base media, whose moov box carries duration and display size
+ISO_BMFF_TYPES = set(ISO_BMFF_BRANDS.values()) | {'video/mp4'}
+
+async def describe(read_at, size):
+    """Metadata readable from the container itself: real MIME type, byte size and, for MP4/MOV, duration and size.
+
+    Image dimensions and the blurhash need a full decode, so they come from the derivative worker instead.
+    """
+    mime_type = sniff_media_type(await read_at(0, SNIFF_BYTES))
+    metadata = {'mime_type': mime_type, 'size': size}
+    if mime_type in ISO_BMFF_TYPES and mime_type.startswith('video/'):
+        moov = await mp4.find_moov(read_at, size)
+        if moov:
+            metadata.update(mp4.moov_metadata(moov))
+    return metadata
+
+async def describe_upload(uploaded_file: UploadFile, size):
+    async def read_at(offset, length):
+        await uploaded_file.seek(offset)
+        return await uploaded_file.read(length)
+
+    try:
+        return await describe(read_at, size)
+    finally:
+        await uploaded_file.seek(0)
+
+async def describe_object(object_key, size):
+    # Only the header boxes and moov are fetched, never the media data in between
+    async def read_at(offset, length):
+        return await storage.read_range(object_key, offset, min(offset + length, size) - 1)
+
+    return await describe(read_at, size)
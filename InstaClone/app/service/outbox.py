@@ -0,0 +1,211 @@
+import os
+import random
+import socket
+import asyncio
+import hashlib
+import logging
+from contextlib import suppress
+from uuid import uuid4
+from datetime import timedelta
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from models.posts import Post
+from config.database import SessionLocal
+from config.minio import presigned_url
+from config.storage import storage
+from repository import media as media_repository
+from repository import outbox as outbox_repository
+from service.uploads import PART_SIZE, add_variants, new_object_key, store_media, stream_upload
+from service.metadata import describe_upload
+from service.timeline import fan_out
+from utils.circuit_breaker import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_DIR = os.getenv('OUTBOX_DIR', 'outbox')
+OUTBOX_POLL_INTERVAL = float(os.getenv('OUTBOX_POLL_INTERVAL', 2))
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', 10))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', 8))
+OUTBOX_LEASE = timedelta(minutes=10)
+# Renewed well before it runs out, so a slow delivery is never claimed (and delivered) a second time
+OUTBOX_LEASE_RENEW_INTERVAL = OUTBOX_LEASE / 3
+BACKOFF_BASE_SECONDS = 2
+BACKOFF_MAX_SECONDS = 300
+
+# Spooled files live on this machine's disk, so each host only drains its own rows
+HOST = socket.gethostname()
+
+def backoff(attempts):
+    # Exponential with full jitter, so a recovering MinIO is not hit by every retry at once
+    return timedelta(seconds=random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempts)))
+
+def persist(source, path):
+    sha256 = hashlib.sha256()
+    with open(path, 'wb') as target:
+        while chunk := source.read(PART_SIZE):
+            sha256.update(chunk)
+            target.write(chunk)
+        target.flush()
+        os.fsync(target.fileno())
+    return sha256.hexdigest()
+
+async def spool(uploaded_file: UploadFile):
+    os.makedirs(OUTBOX_DIR, exist_ok=True)
+    local_path = os.path.join(OUTBOX_DIR, str(uuid4()))
+    sha256 = await run_in_threadpool(persist, uploaded_file.file, local_path)
+    return local_path, sha256
+
+async def enqueue(uploaded_file: UploadFile, caption, user_id, session: Session):
+    """Spool the upload to local disk and create its post right away, with media pending."""
+    local_path, sha256 = await spool(uploaded_file)
+    object_key = new_object_key(uploaded_file.filename)
+
+    def save():
+        post = Post(file_url=presigned_url(object_key), caption=caption, user_id=user_id, media_status='pending')
+        session.add(post)
+        session.flush()
+        outbox_repository.create(
+            session, post_id=post.uid, object_key=object_key, local_path=local_path, host=HOST,
+            content_type=uploaded_file.content_type, sha256=sha256
+        )
+        session.commit()
+        session.refresh(post)
+        return post
+
+    try:
+        return await run_in_threadpool(save)
+    except Exception:
+        os.remove(local_path)
+        raise
+
+async def enqueue_object(uploaded_file: UploadFile, session: Session):
+    """Spool a bare upload (no post yet) that must end up under exactly the returned key."""
+    local_path, sha256 = await spool(uploaded_file)
+    object_key = new_object_key(uploaded_file.filename)
+
+    def save():
+        outbox_repository.create(
+            session, post_id=None, object_key=object_key, local_path=local_path, host=HOST,
+            content_type=uploaded_file.content_type, sha256=sha256
+        )
+        session.commit()
+
+    try:
+        await run_in_threadpool(save)
+    except Exception:
+        os.remove(local_path)
+        raise
+    return object_key
+
+async def deliver(item, session: Session):
+    with open(item.local_path, 'rb') as file:
+        uploaded_file = UploadFile(
+            file, filename=item.object_key.rsplit('/', 1)[-1], headers=Headers({'content-type': item.content_type})
+        )
+        if item.post_id is None:
+            # The client already holds a URL for this key, so deduplicating onto another key is not an option
+            stored = await stream_upload(uploaded_file, item.object_key)
+            media_info = await describe_upload(uploaded_file, stored.size)
+            media = await run_in_threadpool(
+                media_repository.create, session, stored.sha256, stored.key, stored.etag, stored.size,
+                item.content_type, media_info
+            )
+            # Same bytes already stored under another key: this copy stays, served as a plain original
+            if media:
+                await add_variants(session, media, media_info)
+                await run_in_threadpool(media_repository.attach_waiting_posts, session, media)
+            await run_in_threadpool(outbox_repository.mark_done, session, item)
+            os.remove(item.local_path)
+            return
+        media, _ = await store_media(uploaded_file, session, item.object_key)
+
+    def finish():
+        post = session.get(Post, item.post_id)
+        if post:
+            # A duplicate may have resolved to content that was already stored under another key
+            post.file_url = presigned_url(media.object_key)
+            media_repository.attach(session, post, media)
+            post.media_status = 'ready'
+        item.status = 'done'
+        session.commit()
+
+    await run_in_threadpool(finish)
+    os.remove(item.local_path)
+    # Only now is the post worth showing, so this is where it reaches followers' timelines
+    await run_in_threadpool(fan_out, item.post_id)
+
+async def deliver_leased(item, session: Session, leased_until):
+    heartbeat = asyncio.create_task(keep_leased(item.uid, leased_until))
+    try:
+        await deliver(item, session)
+    finally:
+        heartbeat.cancel()
+
+async def drain_once():
+    if storage.breaker.is_open():
+        # Nothing would get through; do not burn retry attempts on it
+        return 0
+    session = SessionLocal()
+    try:
+        items = await run_in_threadpool(outbox_repository.due, session, HOST, OUTBOX_BATCH_SIZE)
+        for item in items:
+            leased_until = await run_in_threadpool(outbox_repository.claim, session, item, OUTBOX_LEASE)
+            if not leased_until:
+                continue
+            try:
+                await deliver_leased(item, session, leased_until)
+            except CircuitOpenError:
+                # The breaker opened mid-batch: leave the item for the next pass without counting an attempt
+                await run_in_threadpool(session.rollback)
+                await run_in_threadpool(outbox_repository.release, session, item)
+                break
+            except Exception as error:
+                await run_in_threadpool(session.rollback)
+                give_up = item.attempts + 1 >= OUTBOX_MAX_ATTEMPTS
+                await run_in_threadpool(
+                    outbox_repository.schedule_retry, session, item, repr(error), backoff(item.attempts), give_up
+                )
+                if give_up:
+                    # Nothing reads the spooled copy again; the failed row keeps the error for inspection
+                    with suppress(FileNotFoundError):
+                        os.remove(item.local_path)
+                    if item.post_id:
+                        await run_in_threadpool(mark_post_failed, session, item.post_id)
+        return len(items)
+    finally:
+        session.close()
+
+def renew_lease(uid, leased_until):
+    # Own session: the delivery is using the worker's one
+    session = SessionLocal()
+    try:
+        return outbox_repository.extend(session, uid, leased_until, OUTBOX_LEASE)
+    finally:
+        session.close()
+
+async def keep_leased(uid, leased_until):
+    while leased_until:
+        await asyncio.sleep(OUTBOX_LEASE_RENEW_INTERVAL.total_seconds())
+        try:
+            leased_until = await run_in_threadpool(renew_lease, uid, leased_until)
+        except Exception:
+            logger.exception('Renewing the outbox lease on %s failed', uid)
+            continue
+        if not leased_until:
+            logger.warning('Lost the outbox lease on %s; it may be delivered twice', uid)
+
+def mark_post_failed(session: Session, post_id):
+    post = session.get(Post, post_id)
+    if post:
+        post.media_status = 'failed'
+        session.commit()
+
+async def run_worker():
+    while True:
+        try:
+            await drain_once()
+        except Exception:
+            logger.exception('Upload outbox drain failed')
+        await asyncio.sleep(OUTBOX_POLL_INTERVAL)
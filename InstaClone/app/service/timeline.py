@@ -0,0 +1,98 @@
+import os
+import asyncio
+import logging
+from uuid import UUID
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from config.database import SessionLocal
+from models.posts import Post
+from models.users import User
+from repository import follows as follows_repository
+from repository import posts as posts_repository
+from repository import timeline as timeline_repository
+from utils import sql
+
+logger = logging.getLogger(__name__)
+
+# Authors with at least this many followers are not fanned out; their posts are merged in at read time
+CELEBRITY_FOLLOWERS = int(os.getenv('CELEBRITY_FOLLOWERS', 10_000))
+FANOUT_BATCH_SIZE = int(os.getenv('FANOUT_BATCH_SIZE', 1000))
+# How many of an account's recent posts appear in a new follower's timeline straight away
+FOLLOW_BACKFILL_POSTS = 20
+# Entries kept per timeline; anything older is only reachable from the author's profile
+TIMELINE_MAX_ENTRIES = int(os.getenv('TIMELINE_MAX_ENTRIES', 800))
+TRIM_INTERVAL = float(os.getenv('TIMELINE_TRIM_INTERVAL', 300))
+# Users whose timelines are trimmed per pass; every timeline is covered over successive passes
+TRIM_BATCH_SIZE = int(os.getenv('TIMELINE_TRIM_BATCH_SIZE', 500))
+# Advisory lock id; every worker runs the loop, but only the lock holder trims
+TRIM_LOCK_ID = 0x74696D656C696E65
+
+# Where the trim sweep resumes; None starts from the first user again
+trim_after = None
+
+def fan_out(post_id: UUID):
+    """Copy a ready post into its author's and followers' timelines, one committed batch of followers at a time."""
+    session = SessionLocal()
+    try:
+        post = session.get(Post, post_id)
+        if not post or post.media_status != 'ready':
+            return
+        timeline_repository.add(session, [post.user_id], [post])
+        if session.get(User, post.user_id).followers_count >= CELEBRITY_FOLLOWERS:
+            return
+        after = None
+        while followers := follows_repository.follower_ids(session, post.user_id, FANOUT_BATCH_SIZE, after):
+            timeline_repository.add(session, followers, [post])
+            after = followers[-1]
+    except Exception:
+        # Runs after the response was sent; a failure must not take anything else down with it
+        logger.exception('Timeline fan-out failed for post %s', post_id)
+    finally:
+        session.close()
+
+def backfill(follower_id: UUID, followee_id: UUID):
+    """Copy a newly followed account's recent posts into the follower's timeline."""
+    session = SessionLocal()
+    try:
+        followee = session.get(User, followee_id)
+        if not followee or followee.followers_count >= CELEBRITY_FOLLOWERS:
+            return
+        posts = posts_repository.latest_by_author(session, followee_id, FOLLOW_BACKFILL_POSTS)
+        timeline_repository.add(session, [follower_id], posts)
+    except Exception:
+        # Runs after the response was sent, like fan_out
+        logger.exception('Timeline backfill failed for %s following %s', follower_id, followee_id)
+    finally:
+        session.close()
+
+def home_timeline(session: Session, user_id: UUID, limit: int, after=None):
+    """Up to `limit` posts for a user's home feed, newest first.
+
+    Fanned-out posts are one range scan over the user's timeline; posts by followed celebrities
+    come from the (user_id, created_at, uid) index on posts and are merged in by the same key.
+    """
+    positions = timeline_repository.page(session, user_id, limit, after)
+    celebrities = follows_repository.celebrities_followed(session, user_id, CELEBRITY_FOLLOWERS)
+    if celebrities:
+        merged = {tuple(row) for row in positions} | {tuple(row) for row in posts_repository.by_authors(session, celebrities, limit, after)}
+        positions = sorted(merged, reverse=True)[:limit]
+    posts = {post.uid: post for post in posts_repository.get_many(session, [uid for _, uid in positions])}
+    return [posts[uid] for _, uid in positions if uid in posts]
+
+def trim_once():
+    global trim_after
+    session = SessionLocal()
+    try:
+        with sql.advisory_lock(session, TRIM_LOCK_ID) as acquired:
+            if acquired:
+                trim_after = timeline_repository.trim(session, TRIM_BATCH_SIZE, TIMELINE_MAX_ENTRIES, trim_after)
+    finally:
+        session.close()
+
+async def run_trimmer():
+    while True:
+        try:
+            await run_in_threadpool(trim_once)
+        except Exception:
+            logger.exception('Timeline trim failed')
+        await asyncio.sleep(TRIM_INTERVAL)
@@ -0,0 +1,176 @@
+import os
+import asyncio
+import hashlib
+import logging
+from uuid import uuid4
+from dataclasses import dataclass
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from config.database import SessionLocal
+from config.minio import presigned_url
+from config.storage import storage
+from repository import media as media_repository
+from service.derivatives import create_derivatives
+from service.metadata import describe_object, describe_upload
+
+logger = logging.getLogger(__name__)
+
+# S3 rejects multipart parts smaller than 5 MiB (except the last one), so this
+# is also the most we ever hold in memory for a single upload.
+PART_SIZE = 5 * 1024 * 1024
+
+# Largest upload accepted per top-level media type
+MAX_UPLOAD_BYTES = {
+    'image': 20 * 1024 * 1024,
+    'video': 1024 * 1024 * 1024,
+}
+
+# How many files of one multi-file request are sent to MinIO at the same time
+UPLOAD_CONCURRENCY = int(os.getenv('UPLOAD_CONCURRENCY', 4))
+
+@dataclass
+class StoredObject:
+    key: str
+    etag: str
+    size: int
+    sha256: str
+
+def new_object_key(filename):
+    return 'posts/' + str(uuid4().int) + '_' + filename
+
+def multipart_etag(part_digests):
+    # S3/MinIO ETag of a multipart object: md5 of the concatenated part md5s, suffixed with the part count
+    combined = hashlib.md5(b''.join(part_digests)).hexdigest()
+    return f'{combined}-{len(part_digests)}'
+
+async def stream_upload(uploaded_file: UploadFile, object_key: str = None) -> StoredObject:
+    """Copy an UploadFile to object storage one part at a time, hashing as the bytes go by."""
+    object_key = object_key or new_object_key(uploaded_file.filename)
+    content_type = uploaded_file.content_type or 'application/octet-stream'
+    sha256 = hashlib.sha256()
+
+    chunk = await uploaded_file.read(PART_SIZE)
+    if len(chunk) < PART_SIZE:
+        # Fits in a single part - a plain PUT saves the multipart round trips
+        sha256.update(chunk)
+        response = await storage.put_object(object_key, chunk, content_type)
+        etag = hashlib.md5(chunk).hexdigest()
+        await verify_etag(object_key, etag, response['ETag'])
+        return StoredObject(key=object_key, etag=etag, size=len(chunk), sha256=sha256.hexdigest())
+
+    upload_id = await storage.create_multipart_upload(object_key, content_type)
+    parts, part_digests, size = [], [], 0
+    try:
+        while chunk:
+            part_number = len(parts) + 1
+            sha256.update(chunk)
+            part_digests.append(hashlib.md5(chunk).digest())
+            size += len(chunk)
+            part_etag = await storage.upload_part(object_key, upload_id, part_number, chunk)
+            parts.append({'PartNumber': part_number, 'ETag': part_etag})
+            chunk = await uploaded_file.read(PART_SIZE)
+        response = await storage.complete_multipart_upload(object_key, upload_id, parts)
+    except Exception:
+        await storage.abort_multipart_upload(object_key, upload_id)
+        raise
+
+    etag = multipart_etag(part_digests)
+    await verify_etag(object_key, etag, response['ETag'])
+    return StoredObject(key=object_key, etag=etag, size=size, sha256=sha256.hexdigest())
+
+async def verify_etag(object_key, expected, received):
+    if received.strip('"') != expected:
+        await storage.delete_object(object_key)
+        raise IOError(f'Checksum mismatch while uploading {object_key}: expected {expected}, got {received}')
+
+async def file_digest(uploaded_file: UploadFile):
+    # Hashes the locally spooled upload so duplicates are caught before any bytes go to MinIO
+    sha256 = hashlib.sha256()
+    while chunk := await uploaded_file.read(PART_SIZE):
+        sha256.update(chunk)
+    await uploaded_file.seek(0)
+    return sha256.hexdigest()
+
+async def store_media(uploaded_file: UploadFile, session: Session, object_key: str = None):
+    """Store an upload once per distinct content. Returns (MediaObject, is_duplicate)."""
+    digest = await file_digest(uploaded_file)
+    existing = await run_in_threadpool(media_repository.add_reference, session, digest)
+    if existing:
+        return existing, True
+
+    stored = await stream_upload(uploaded_file, object_key)
+    media_info = await describe_upload(uploaded_file, stored.size)
+    return await register_media(session, stored, uploaded_file.content_type, media_info)
+
+async def register_media(session: Session, stored: StoredObject, content_type, media_info):
+    """Record content that is already in storage and render its variants. Returns (MediaObject, is_duplicate)."""
+    media = await run_in_threadpool(
+        media_repository.create, session, stored.sha256, stored.key, stored.etag, stored.size, content_type, media_info
+    )
+    if media is None:
+        # Someone else stored the same bytes first - keep theirs and drop ours
+        await storage.delete_object(stored.key)
+        return await run_in_threadpool(media_repository.add_reference, session, stored.sha256), True
+
+    await add_variants(session, media, media_info)
+    return media, False
+
+async def register_assembled(object_key, content_type):
+    """Record an object a resumable upload assembled in storage and render its variants.
+
+    The bytes never passed through one request, so the digest is taken from storage afterwards.
+    The client already holds this key: like a spooled bare upload, a duplicate stays a plain original.
+    """
+    session = SessionLocal()
+    try:
+        head = await storage.head_object(object_key)
+        sha256 = await storage.sha256(object_key)
+        media_info = await describe_object(object_key, head['ContentLength'])
+        media = await run_in_threadpool(
+            media_repository.create, session, sha256, object_key, head['ETag'].strip('"'), head['ContentLength'],
+            content_type, media_info
+        )
+        if media:
+            await add_variants(session, media, media_info)
+            await run_in_threadpool(media_repository.attach_waiting_posts, session, media)
+    except Exception:
+        # The object is still served as a plain original
+        logger.exception('Could not register resumable upload %s', object_key)
+    finally:
+        session.close()
+
+async def add_variants(session: Session, media, media_info):
+    if media.content_type.startswith('image/'):
+        variants, image_info = await image_derivatives(media.object_key)
+        await run_in_threadpool(media_repository.set_variants, session, media, variants, {**media_info, **image_info})
+
+async def image_derivatives(object_key):
+    """Return (variants, {width, height, blurhash}) for a stored image."""
+    try:
+        return await create_derivatives(object_key)
+    except Exception:
+        # Formats Pillow cannot decode are still served, just without resized copies or a placeholder
+        logger.exception('Could not render derivatives for %s', object_key)
+        return None, {}
+
+def upload_summary(media, duplicate):
+    return {
+        'url': presigned_url(media.object_key), 'key': media.object_key, 'etag': media.etag,
+        'variants': media.variants, 'media_info': media.media_info, 'duplicate': duplicate
+    }
+
+async def store_many(uploaded_files):
+    """Store several uploads concurrently (at most UPLOAD_CONCURRENCY at once), keeping their order."""
+    semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+    async def store_one(uploaded_file):
+        async with semaphore:
+            # Sessions are not safe to share between concurrent tasks, so each file gets its own
+            session = SessionLocal()
+            try:
+                return upload_summary(*await store_media(uploaded_file, session))
+            finally:
+                session.close()
+
+    return await asyncio.gather(*(store_one(uploaded_file) for uploaded_file in uploaded_files))
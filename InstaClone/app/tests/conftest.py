@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+import pytest
+
+# Settings the app reads at import time; a real .env or environment still wins
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.gettempdir(), 'instaclone-tests.db'))
+os.environ.setdefault('DB_RAISELOAD', 'true')
+os.environ.setdefault('SECRET_KEY', 'tests')
+os.environ.setdefault('MY_BUCKET', 'media')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'tests')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'tests')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from config.database import Base, engine
+from utils.query_budget import max_queries
+import models
+
+@pytest.fixture(autouse=True)
+def database():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+
+@pytest.fixture
+def client():
+    # Not used as a context manager, so the lifespan's outbox and counter workers never start
+    # and every statement the budget sees comes from the request under test
+    import main
+    return TestClient(main.app)
+
+@pytest.fixture
+def query_budget():
+    """max_queries(limit) for the engine the app uses."""
+    return max_queries
+
+@pytest.fixture
+def login(client):
+    """Create a user and return (uid, auth headers) for them."""
+    def login(username):
+        response = client.post('/create-user', json={
+            'email': f'{username}@example.com', 'username': username, 'password': 'password',
+            'first_name': username, 'last_name': 'Tester', 'age': 30, 'gender': 'MALE', 'bio': ''
+        })
+        assert response.status_code == 200, response.text
+        token = client.post('/login', data={'username': username, 'password': 'password'}).json()['access_token']
+        return response.json()['uid'], {'Authorization': f'Bearer {token}'}
+    return login
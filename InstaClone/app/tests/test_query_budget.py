@@ -0,0 +1,61 @@
+"""Statement counts for the read endpoints that render many posts or comments.
+
+Each budget is the same however many posts, comments and likes are on the page, so a
+relationship loaded per row (an N+1) fails these tests instead of slowing production down.
+"""
+import pytest
+
+@pytest.fixture
+def seeded(client, login):
+    """A viewer following an author who has posts with comments and likes from several users."""
+    def seed(posts, comments_per_post):
+        viewer_id, viewer = login('viewer')
+        author_id, author = login('author')
+        fans = [login(f'fan{number}')[1] for number in range(3)]
+        assert client.post(f'/users/{author_id}/follow', headers=viewer).status_code == 204
+        post_ids = []
+        for number in range(posts):
+            post = client.post('/create', json={
+                'file_url': f'http://minio/media/posts/{number}_photo.jpg', 'caption': f'post {number}',
+                'user_id': author_id
+            }).json()
+            for count in range(comments_per_post):
+                headers = fans[count % len(fans)]
+                client.post(f"/posts/{post['uid']}/comments", json={'text': f'comment {count}'}, headers=headers)
+            for headers in fans:
+                client.post(f"/posts/{post['uid']}/like", headers=headers)
+            post_ids.append(post['uid'])
+        return viewer, post_ids
+    return seed
+
+# The user, their timeline, celebrity followees, the posts with authors, the viewer's likes, like counts
+FEED_BUDGET = 6
+# The user, the post with its author, its comments with theirs, the viewer's like, the like count
+POST_DETAIL_BUDGET = 5
+# The user, the post, its comments with their authors
+COMMENTS_BUDGET = 3
+
+@pytest.mark.parametrize('posts', [2, 10])
+@pytest.mark.parametrize('view', ['grid', 'detail'])
+def test_feed_query_count(client, seeded, query_budget, posts, view):
+    viewer, _ = seeded(posts, comments_per_post=3)
+    with query_budget(FEED_BUDGET):
+        response = client.get('/feed', params={'view': view}, headers=viewer)
+    assert response.status_code == 200, response.text
+    assert len(response.json()['posts']) == posts
+
+@pytest.mark.parametrize('comments', [1, 15])
+def test_post_detail_query_count(client, seeded, query_budget, comments):
+    viewer, (post_id,) = seeded(1, comments_per_post=comments)
+    with query_budget(POST_DETAIL_BUDGET):
+        response = client.get(f'/posts/{post_id}', headers=viewer)
+    assert response.status_code == 200, response.text
+    assert len(response.json()['comments']['comments']) == comments
+
+@pytest.mark.parametrize('comments', [1, 15])
+def test_comments_query_count(client, seeded, query_budget, comments):
+    viewer, (post_id,) = seeded(1, comments_per_post=comments)
+    with query_budget(COMMENTS_BUDGET):
+        response = client.get(f'/posts/{post_id}/comments', headers=viewer)
+    assert response.status_code == 200, response.text
+    assert len(response.json()['comments']) == comments
@@ -0,0 +1,57 @@
+import math
+
+# Encoder for https://blurha.sh placeholders: a few DCT components of the image packed
+# into a ~30 character base83 string that clients decode into a blurred preview.
+
+BASE83 = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~'
+
+def base83(value, length):
+    return ''.join(BASE83[value // 83 ** (length - i - 1) % 83] for i in range(length))
+
+def srgb_to_linear(value):
+    value /= 255
+    return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+def linear_to_srgb(value):
+    value = max(0.0, min(1.0, value))
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+def sign_pow(value, exponent):
+    return math.copysign(abs(value) ** exponent, value)
+
+def encode(rgb: bytes, width, height, x_components=4, y_components=3):
+    """Blurhash of raw 8-bit RGB pixel data. Keep the image small (~32px) - cost is per pixel per component."""
+    linear = [srgb_to_linear(value) for value in range(256)]
+    pixels = [(linear[rgb[i]], linear[rgb[i + 1]], linear[rgb[i + 2]]) for i in range(0, width * height * 3, 3)]
+    factors = []
+    for j in range(y_components):
+        cos_y = [math.cos(math.pi * j * y / height) for y in range(height)]
+        for i in range(x_components):
+            cos_x = [math.cos(math.pi * i * x / width) for x in range(width)]
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                for x in range(width):
+                    basis = cos_x[x] * cos_y[y]
+                    pr, pg, pb = pixels[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = (1 if i == j == 0 else 2) / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    blurhash = base83(x_components - 1 + (y_components - 1) * 9, 1)
+    if ac:
+        quantised_max = int(max(0, min(82, math.floor(max(abs(v) for f in ac for v in f) * 166 - 0.5))))
+        maximum = (quantised_max + 1) / 166
+    else:
+        quantised_max, maximum = 0, 1
+    blurhash += base83(quantised_max, 1)
+    blurhash += base83((linear_to_srgb(dc[0]) << 16) + (linear_to_srgb(dc[1]) << 8) + linear_to_srgb(dc[2]), 4)
+    for factor in ac:
+        r, g, b = (int(max(0, min(18, math.floor(sign_pow(v / maximum, 0.5) * 9 + 9.5)))) for v in factor)
+        blurhash += base83(r * 19 * 19 + g * 19 + b, 2)
+    return blurhash
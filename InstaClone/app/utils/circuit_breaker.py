@@ -0,0 +1,116 @@
+import time
+from threading import Lock
+from collections import deque
+
+class CircuitOpenError(Exception):
+    def __init__(self, name, retry_after):
+        super().__init__(f'{name} is unavailable, retry in {retry_after:.0f}s')
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """Error-rate circuit breaker.
+
+    closed: calls go through; once at least `minimum_calls` outcomes in the last
+        `window` seconds fail at `failure_threshold` or more, the circuit opens.
+    open: calls are rejected immediately for `reset_timeout` seconds.
+    half_open: up to `half_open_calls` trial calls go through; all succeeding closes
+        the circuit, any failing opens it again, and so does not hearing back from
+        them within `half_open_timeout` seconds.
+
+    Every allowed call must end in record_success, record_failure or release.
+    """
+
+    def __init__(self, name, failure_threshold=0.5, minimum_calls=10, window=30, reset_timeout=15, half_open_calls=3,
+                 half_open_timeout=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.minimum_calls = minimum_calls
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.half_open_timeout = half_open_timeout
+        self.lock = Lock()
+        self.state = 'closed'
+        self.outcomes = deque()
+        self.opened_at = 0.0
+        self.half_opened_at = 0.0
+        self.trials = 0
+        self.trial_successes = 0
+        self.counters = {'calls': 0, 'successes': 0, 'failures': 0, 'rejected': 0, 'released': 0, 'opened': 0}
+
+    def allow(self):
+        with self.lock:
+            now = time.monotonic()
+            if self.state == 'half_open' and now - self.half_opened_at >= self.half_open_timeout:
+                # Trials that never report back are as good as failed
+                self.trip()
+            if self.state == 'open' and now - self.opened_at >= self.reset_timeout:
+                self.state, self.trials, self.trial_successes = 'half_open', 0, 0
+                self.half_opened_at = now
+            if self.state == 'open' or (self.state == 'half_open' and self.trials >= self.half_open_calls):
+                self.counters['rejected'] += 1
+                return False
+            if self.state == 'half_open':
+                self.trials += 1
+            self.counters['calls'] += 1
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.counters['successes'] += 1
+            if self.state == 'half_open':
+                self.trial_successes += 1
+                if self.trial_successes >= self.half_open_calls:
+                    self.state = 'closed'
+                    self.outcomes.clear()
+                return
+            self.record_outcome(True)
+
+    def record_failure(self):
+        with self.lock:
+            self.counters['failures'] += 1
+            if self.state == 'half_open':
+                self.trip()
+                return
+            self.record_outcome(False)
+            failures = sum(1 for _, ok in self.outcomes if not ok)
+            if len(self.outcomes) >= self.minimum_calls and failures / len(self.outcomes) >= self.failure_threshold:
+                self.trip()
+
+    def release(self):
+        # The call ended without telling us anything (cancelled): hand its trial slot back
+        with self.lock:
+            self.counters['released'] += 1
+            if self.state == 'half_open' and self.trials > 0:
+                self.trials -= 1
+
+    def record_outcome(self, ok):
+        now = time.monotonic()
+        self.outcomes.append((now, ok))
+        while self.outcomes and now - self.outcomes[0][0] > self.window:
+            self.outcomes.popleft()
+
+    def trip(self):
+        self.state = 'open'
+        self.opened_at = time.monotonic()
+        self.outcomes.clear()
+        self.counters['opened'] += 1
+
+    def is_open(self):
+        with self.lock:
+            return self.state == 'open' and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def retry_after(self):
+        with self.lock:
+            return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)) if self.state == 'open' else 0.0
+
+    def metrics(self):
+        with self.lock:
+            failures = sum(1 for _, ok in self.outcomes if not ok)
+            return {
+                'name': self.name,
+                'state': self.state,
+                'window_calls': len(self.outcomes),
+                'window_failure_rate': failures / len(self.outcomes) if self.outcomes else 0.0,
+                **self.counters,
+            }
@@ -0,0 +1,27 @@
+import json
+import base64
+from uuid import UUID
+from typing import Optional
+from datetime import datetime
+from fastapi import HTTPException
+
+# Opaque page cursors: the (created_at, uid) of the last row a client has seen
+
+def encode_cursor(created_at: datetime, uid: UUID):
+    payload = json.dumps([created_at.isoformat(), str(uid)]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+def decode_cursor(cursor: str):
+    """Return (created_at, uid); raises ValueError for anything that is not a cursor we issued."""
+    try:
+        created_at, uid = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created_at), UUID(uid)
+    except (TypeError, ValueError) as error:
+        raise ValueError('Invalid cursor.') from error
+
+def page_position(cursor: Optional[str] = None):
+    """Dependency: the decoded `cursor` query parameter, or None for the first page."""
+    try:
+        return decode_cursor(cursor) if cursor else None
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=f"{ve}")
@@ -0,0 +1,170 @@
+import os
+import time
+import shutil
+import hashlib
+import tempfile
+from threading import Lock
+from dataclasses import dataclass
+from datetime import datetime
+from collections import OrderedDict, deque
+
+@dataclass
+class CachedFile:
+    path: str
+    size: int
+    etag: str
+    last_modified: datetime
+    content_type: str
+    stat: os.stat_result
+
+class DiskLRUCache:
+    """Byte-budgeted LRU of whole objects kept as files on local disk.
+
+    Only objects asked for at least `admit_after` times (among the last `max_tracked`
+    keys seen) and no larger than `max_object_bytes` are written, so one-off views of
+    big videos do not flush the hot set. The index lives in memory, so every process
+    keeps its own subdirectory and clears the ones left behind by dead processes.
+    Object keys never get new content (every upload gets a fresh key), so entries
+    need no revalidation - only invalidation when the object is deleted.
+
+    A hit hands out a path that the response opens a little later, so evicted files
+    are only unlinked `retire_after` seconds on; once open, unlinking them is harmless.
+    """
+
+    def __init__(self, directory, max_bytes, max_object_bytes, admit_after=2, max_tracked=100_000, retire_after=60):
+        self.root = directory
+        self.max_bytes = max_bytes
+        self.max_object_bytes = max_object_bytes
+        self.admit_after = admit_after
+        self.max_tracked = max_tracked
+        self.retire_after = retire_after
+        self.entries = OrderedDict()
+        self.retired = deque()
+        self.views = OrderedDict()
+        self.lock = Lock()
+        self.pid = None
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def directory(self):
+        # Resolved lazily so a worker forked after import does not share its parent's files
+        if self.pid != os.getpid():
+            with self.lock:
+                if self.pid != os.getpid():
+                    self.pid = os.getpid()
+                    self.entries.clear()
+                    self.retired.clear()
+                    self.bytes = 0
+                    os.makedirs(self.root, exist_ok=True)
+                    self.remove_stale()
+        return os.path.join(self.root, str(self.pid))
+
+    def remove_stale(self):
+        # Directories of processes that are gone, and our own if the pid was used before
+        for name in os.listdir(self.root):
+            if name.isdigit() and int(name) != self.pid and not process_alive(int(name)):
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+        shutil.rmtree(os.path.join(self.root, str(self.pid)), ignore_errors=True)
+        os.makedirs(os.path.join(self.root, str(self.pid)))
+
+    def get(self, key):
+        directory = self.directory
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            name, size, etag, last_modified, content_type = entry
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                self.drop(key)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return CachedFile(path, size, etag, last_modified, content_type, stat)
+
+    def admit(self, key, size):
+        """Count a view of `key`; True once it is popular enough and small enough to be worth caching."""
+        if size > self.max_object_bytes:
+            return False
+        with self.lock:
+            if key in self.entries:
+                return False
+            views = self.views.pop(key, 0) + 1
+            if views >= self.admit_after:
+                # Forgotten again right away, so concurrent views do not all write the same file
+                return True
+            self.views[key] = views
+            while len(self.views) > self.max_tracked:
+                self.views.popitem(last=False)
+            return False
+
+    def temporary_file(self):
+        """An open (file, path) in the cache directory to stream an object into before put()."""
+        descriptor, path = tempfile.mkstemp(dir=self.directory, suffix='.part')
+        return os.fdopen(descriptor, 'wb'), path
+
+    def put(self, key, temporary_path, etag, last_modified, content_type):
+        directory = self.directory
+        name = hashlib.sha256(key.encode()).hexdigest()
+        size = os.path.getsize(temporary_path)
+        if size > self.max_object_bytes:
+            os.remove(temporary_path)
+            return
+        os.replace(temporary_path, os.path.join(directory, name))
+        with self.lock:
+            self.drop(key, remove_file=False)
+            # The file under this name is the new copy now; an older retirement must not unlink it
+            self.retired = deque(retired for retired in self.retired if retired[1] != key)
+            self.entries[key] = (name, size, etag, last_modified, content_type)
+            self.bytes += size
+            while self.bytes > self.max_bytes and self.entries:
+                self.drop(next(iter(self.entries)))
+                self.evictions += 1
+            self.reap()
+
+    def invalidate(self, key):
+        with self.lock:
+            self.drop(key)
+            self.reap()
+
+    def drop(self, key, remove_file=True):
+        # Caller holds the lock
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        self.bytes -= entry[1]
+        if remove_file:
+            self.retired.append((time.monotonic(), key, entry[0]))
+
+    def reap(self):
+        # Caller holds the lock. Unlink retired files no hit can still be about to open.
+        cutoff = time.monotonic() - self.retire_after
+        while self.retired and self.retired[0][0] <= cutoff:
+            _, _, name = self.retired.popleft()
+            try:
+                os.remove(os.path.join(self.root, str(self.pid), name))
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            return {
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'entries': len(self.entries),
+                'retired': len(self.retired), 'bytes': self.bytes, 'max_bytes': self.max_bytes
+            }
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,14 @@
+from passlib.context import CryptContext
+
+password_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+
+class Hash:
+    def bcrypt(password: str):
+        return password_context.hash(password)
+
+    def verify_password(entered: str, original: str):
+        return password_context.verify(entered, original)
+
+    def is_hashed(stored: str):
+        # Accounts created before passwords were hashed still hold the password as entered
+        return password_context.identify(stored) is not None
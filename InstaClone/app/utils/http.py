@@ -0,0 +1,51 @@
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+def parse_range(header, size):
+    """Turn a single `bytes=` Range header into inclusive (start, end), or None to send the whole body.
+
+    Multi-range requests are answered with the full body, which RFC 9110 allows.
+    """
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    start, _, end = header[len('bytes='):].strip().partition('-')
+    try:
+        if not start:
+            # Suffix range: the last N bytes
+            length = int(end)
+            if length <= 0:
+                raise RangeNotSatisfiable()
+            return max(size - length, 0), size - 1
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, end
+
+def etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    # If-None-Match uses weak comparison
+    candidates = [tag.strip().removeprefix('W/') for tag in header.split(',')]
+    return etag.removeprefix('W/') in candidates
+
+def is_not_modified(request_headers, etag, last_modified):
+    if 'if-none-match' in request_headers:
+        return etag_matches(request_headers['if-none-match'], etag)
+    since = request_headers.get('if-modified-since')
+    if since:
+        try:
+            return last_modified.replace(microsecond=0) <= parsedate_to_datetime(since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def http_date(value):
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
@@ -0,0 +1,10 @@
+import re
+from urllib.parse import unquote
+
+# Every object we write is posts/<uuid as int>_<name>, and derivatives share that prefix,
+# so the number identifies one piece of media and all its variants.
+MEDIA_KEY_PATTERN = re.compile(r'(?:^|/)posts/(\d+)_')
+
+def media_id(key_or_url):
+    match = MEDIA_KEY_PATTERN.search(unquote(key_or_url or ''))
+    return match.group(1) if match else None
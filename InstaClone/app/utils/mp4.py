@@ -0,0 +1,77 @@
+import struct
+
+# Just enough ISO base media (MP4/MOV) parsing to read duration and display size
+# from the moov box, without pulling in ffprobe.
+
+# 'moov' is usually small, but a pathological file should not make us buffer the whole upload
+MAX_MOOV_BYTES = 16 * 1024 * 1024
+
+def box_header(data, offset=0):
+    """Return (box size, box type, header length) for the box at offset; size 0 means 'to the end'."""
+    size, box_type = struct.unpack_from('>I4s', data, offset)
+    if size == 1:
+        return struct.unpack_from('>Q', data, offset + 8)[0], box_type, 16
+    return size, box_type, 8
+
+def children(data, start=0, end=None):
+    end = len(data) if end is None else end
+    offset = start
+    while offset + 8 <= end:
+        size, box_type, header = box_header(data, offset)
+        size = size or end - offset
+        if size < header:
+            return
+        yield box_type, offset + header, min(offset + size, end)
+        offset += size
+
+async def find_moov(read_at, size):
+    """Walk the top-level boxes with read_at(offset, length) and return the moov payload, or None."""
+    offset = 0
+    while offset + 8 <= size:
+        box_size, box_type, header = box_header((await read_at(offset, 16)).ljust(16, b'\0'))
+        box_size = box_size or size - offset
+        if box_size < header:
+            return None
+        if box_type == b'moov':
+            if box_size > MAX_MOOV_BYTES:
+                return None
+            return await read_at(offset + header, box_size - header)
+        offset += box_size
+    return None
+
+def track_size(tkhd, start):
+    version = tkhd[start]
+    # width/height are 16.16 fixed point after the times, ids, layer, volume and the 3x3 matrix
+    matrix = start + (52 if version == 1 else 40)
+    a, b = struct.unpack_from('>ii', tkhd, matrix)
+    width, height = (value >> 16 for value in struct.unpack_from('>II', tkhd, matrix + 36))
+    # A 90/270 degree rotation matrix (phone videos shot in portrait) swaps the displayed sides
+    if a == 0 and b != 0:
+        width, height = height, width
+    return width, height
+
+def moov_metadata(moov):
+    """Duration in seconds and display width/height of the first visual track."""
+    metadata = {}
+    try:
+        read_boxes(moov, metadata)
+    except (struct.error, IndexError):
+        # Truncated or malformed boxes: keep whatever was read before them
+        pass
+    return metadata
+
+def read_boxes(moov, metadata):
+    for box_type, start, end in children(moov):
+        if box_type == b'mvhd':
+            if moov[start] == 1:
+                timescale, duration = struct.unpack_from('>IQ', moov, start + 20)
+            else:
+                timescale, duration = struct.unpack_from('>II', moov, start + 12)
+            if timescale:
+                metadata['duration'] = round(duration / timescale, 3)
+        elif box_type == b'trak' and 'width' not in metadata:
+            for child_type, child_start, _ in children(moov, start, end):
+                if child_type == b'tkhd':
+                    width, height = track_size(moov, child_start)
+                    if width and height:
+                        metadata['width'], metadata['height'] = width, height
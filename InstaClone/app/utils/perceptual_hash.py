@@ -0,0 +1,54 @@
+from itertools import combinations
+
+# 64-bit difference hash (dHash): survives resizing and re-encoding, so reposts of the
+# same picture land within a few bits of each other.
+HASH_SIZE = 8
+HASH_BITS = HASH_SIZE * HASH_SIZE
+
+# Multi-index hashing: the hash is split into BANDS chunks, each stored in its own indexed
+# column. Two hashes within distance r must agree within r // BANDS bits on at least one
+# band (pigeonhole), so a search only probes a few exact values per band index.
+BANDS = 4
+BAND_BITS = HASH_BITS // BANDS
+
+def difference_hash(gray: bytes):
+    """dHash of a (HASH_SIZE + 1) x HASH_SIZE grayscale image: one bit per left/right brightness step."""
+    value = 0
+    for row in range(HASH_SIZE):
+        start = row * (HASH_SIZE + 1)
+        for column in range(HASH_SIZE):
+            value = value << 1 | (gray[start + column] > gray[start + column + 1])
+    return value
+
+def to_signed(value):
+    # Stored in a signed BIGINT column
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+def parse(text):
+    """Signed column value for a hex hash, as produced by the derivative worker."""
+    value = int(text, 16)
+    if not 0 <= value < 1 << HASH_BITS:
+        raise ValueError(f'Perceptual hash must be {HASH_BITS // 4} hex digits.')
+    return to_signed(value)
+
+def to_unsigned(value):
+    return value & ((1 << HASH_BITS) - 1)
+
+def bands(value):
+    value = to_unsigned(value)
+    mask = (1 << BAND_BITS) - 1
+    return [value >> (BAND_BITS * (BANDS - 1 - band)) & mask for band in range(BANDS)]
+
+def band_neighbours(band, radius):
+    """All band values within `radius` flipped bits of `band`."""
+    values = [band]
+    for flips in range(1, radius + 1):
+        for bits in combinations(range(BAND_BITS), flips):
+            flipped = band
+            for bit in bits:
+                flipped ^= 1 << bit
+            values.append(flipped)
+    return values
+
+def distance(a, b):
+    return (to_unsigned(a) ^ to_unsigned(b)).bit_count()
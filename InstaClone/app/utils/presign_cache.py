@@ -0,0 +1,45 @@
+import time
+from threading import Lock
+from collections import OrderedDict
+
+class PresignedURLCache:
+    """LRU of presigned URLs keyed by (bucket, object key).
+
+    A URL is handed out again until `refresh_margin` seconds before it expires, so
+    repeated reads of the same object get an identical, browser/CDN cacheable URL.
+    """
+
+    def __init__(self, max_entries=10_000, refresh_margin=300):
+        self.max_entries = max_entries
+        self.refresh_margin = refresh_margin
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, bucket, object_key):
+        with self.lock:
+            entry = self.entries.get((bucket, object_key))
+            if entry is None or entry[1] - self.refresh_margin <= time.monotonic():
+                self.misses += 1
+                return None
+            self.entries.move_to_end((bucket, object_key))
+            self.hits += 1
+            return entry[0]
+
+    def put(self, bucket, object_key, url, expires_in):
+        with self.lock:
+            self.entries[(bucket, object_key)] = (url, time.monotonic() + expires_in)
+            self.entries.move_to_end((bucket, object_key))
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, bucket, object_key):
+        with self.lock:
+            self.entries.pop((bucket, object_key), None)
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self.entries)}
@@ -0,0 +1,30 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from config.database import engine
+
+@contextmanager
+def max_queries(limit, bind=engine):
+    """Fail with AssertionError if the block runs more than `limit` SQL statements on `bind`.
+
+    Yields the list of statements seen so far, for tests that want to inspect them:
+
+        with max_queries(4):
+            client.get('/feed')
+
+    Counts every statement on the engine, from any thread, so keep background workers
+    out of the app under test.
+    """
+    statements = []
+
+    def record(connection, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(bind, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, 'before_cursor_execute', record)
+    if len(statements) > limit:
+        raise AssertionError(
+            f'{len(statements)} SQL statements over a budget of {limit}:\n' + '\n'.join(statements)
+        )
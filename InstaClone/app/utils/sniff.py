@@ -0,0 +1,26 @@
+# Enough leading bytes to recognise every signature below
+SNIFF_BYTES = 16
+
+ISO_BMFF_BRANDS = {
+    b'heic': 'image/heic', b'heix': 'image/heic', b'mif1': 'image/heif', b'msf1': 'image/heif',
+    b'avif': 'image/avif', b'qt  ': 'video/quicktime',
+}
+
+def sniff_media_type(head: bytes):
+    """Detect the real MIME type of an image/video from its first bytes, or None if unrecognised."""
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if head.startswith((b'GIF87a', b'GIF89a')):
+        return 'image/gif'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    if head[:4] == b'RIFF' and head[8:12] == b'AVI ':
+        return 'video/x-msvideo'
+    if head.startswith(b'\x1a\x45\xdf\xa3'):
+        return 'video/webm'
+    if head[4:8] == b'ftyp':
+        # ISO base media (MP4, MOV, HEIC, AVIF...) - the major brand tells them apart
+        return ISO_BMFF_BRANDS.get(head[8:12], 'video/mp4')
+    return None
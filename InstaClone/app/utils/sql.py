@@ -0,0 +1,75 @@
+from contextlib import contextmanager
+from sqlalchemy import DDL, Table, event, func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+def insert(session: Session, model):
+    """A dialect-specific INSERT, so ON CONFLICT works on both PostgreSQL and SQLite."""
+    if session.get_bind().dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(model)
+
+@contextmanager
+def advisory_lock(session: Session, key: int):
+    """Try to take a PostgreSQL advisory lock for the block without waiting; yields whether we got it.
+
+    Held on a connection of its own, so the session may commit as often as it likes inside.
+    SQLite databases belong to one process, so there it is always granted.
+    """
+    bind = session.get_bind()
+    if bind.dialect.name != 'postgresql':
+        yield True
+        return
+    with bind.connect() as connection:
+        acquired = connection.scalar(select(func.pg_try_advisory_lock(key)))
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.scalar(select(func.pg_advisory_unlock(key)))
+
+class SearchDocument(ColumnElement):
+    """Expression for a generated tsvector column: each (weight, column) pair's text, weighted.
+
+    Only PostgreSQL has tsvector. Elsewhere it compiles to NULL and full-text search goes
+    through the FTS5 tables from fts5_ddl() instead.
+    """
+    type = TSVECTOR()
+    inherit_cache = False
+
+    def __init__(self, config, *weighted_columns):
+        self.config = config
+        self.weighted_columns = weighted_columns
+
+@compiles(SearchDocument, 'postgresql')
+def compile_search_document(element, compiler, **kw):
+    return ' || '.join(
+        f"setweight(to_tsvector('{element.config}', coalesce({column}, '')), '{weight}')"
+        for weight, column in element.weighted_columns
+    )
+
+@compiles(SearchDocument)
+def compile_search_document_elsewhere(element, compiler, **kw):
+    return 'NULL'
+
+def add_fts5_index(table: Table, columns):
+    """On SQLite, create and drop `<table>_fts` - an FTS5 index over `columns`, keyed by uid -
+    along with `table`, with triggers keeping it in step. Local and test databases only, so
+    the uid lookups in the triggers scanning the index are fine."""
+    fts = f'{table.name}_fts'
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    for statement in (
+        f"CREATE VIRTUAL TABLE {fts} USING fts5(uid UNINDEXED, {names}, tokenize='porter unicode61')",
+        f'CREATE TRIGGER {fts}_insert AFTER INSERT ON {table.name} BEGIN '
+        f'INSERT INTO {fts} (uid, {names}) VALUES (new.uid, {new}); END',
+        f'CREATE TRIGGER {fts}_delete AFTER DELETE ON {table.name} BEGIN DELETE FROM {fts} WHERE uid = old.uid; END',
+        f'CREATE TRIGGER {fts}_update AFTER UPDATE OF {names} ON {table.name} BEGIN '
+        f'DELETE FROM {fts} WHERE uid = old.uid; INSERT INTO {fts} (uid, {names}) VALUES (new.uid, {new}); END',
+    ):
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    event.listen(table, 'before_drop', DDL(f'DROP TABLE IF EXISTS {fts}').execute_if(dialect='sqlite'))
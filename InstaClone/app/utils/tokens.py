@@ -0,0 +1,34 @@
+import os
+from uuid import UUID
+from typing import Annotated
+from datetime import datetime, timedelta, timezone
+from jose import jwt, JWTError
+from dotenv import load_dotenv
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.orm import Session
+from config.database import get_db
+from models.users import User
+
+load_dotenv()
+
+SECRET_KEY = os.getenv('SECRET_KEY')
+ALGORITHM = os.getenv('ALGORITHM', 'HS256')
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/login')
+
+def create_access_token(data: dict, expires: timedelta = None):
+    to_encode = data.copy()
+    expiry = datetime.now(timezone.utc) + (expires or timedelta(minutes=15))
+    to_encode.update({'exp': expiry})
+    return jwt.encode(to_encode, SECRET_KEY, ALGORITHM)
+
+def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], session: Session = Depends(get_db)):
+    try:
+        payload = jwt.decode(token, SECRET_KEY, ALGORITHM)
+        user = session.get(User, UUID(payload.get('sub')))
+    except (JWTError, TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='You need to login first!')
+    if not user or user.deleted:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='You need to login first!')
+    return user
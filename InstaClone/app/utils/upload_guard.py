@@ -0,0 +1,103 @@
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from python_multipart.multipart import MultipartParser, parse_options_header
+from utils.sniff import SNIFF_BYTES, sniff_media_type
+
+class MultipartInspector:
+    """Watches a multipart body as it arrives and rejects file parts that lie about
+    their type or outgrow the limit for it, long before the form is fully spooled."""
+
+    def __init__(self, boundary, limits):
+        self.limits = limits
+        self.parser = MultipartParser(boundary, callbacks={
+            'on_part_begin': self.on_part_begin,
+            'on_header_field': self.on_header_field,
+            'on_header_value': self.on_header_value,
+            'on_header_end': self.on_header_end,
+            'on_headers_finished': self.on_headers_finished,
+            'on_part_data': self.on_part_data,
+            'on_part_end': self.on_part_end,
+        })
+        self.broken = False
+
+    def feed(self, data):
+        if self.broken or not data:
+            return
+        try:
+            self.parser.write(data)
+        except HTTPException:
+            raise
+        except Exception:
+            # Malformed bodies are left for the real form parser to report
+            self.broken = True
+
+    def on_part_begin(self):
+        self.headers, self.field, self.value = {}, b'', b''
+        self.is_file, self.declared, self.head, self.size, self.limit = False, '', b'', 0, None
+
+    def on_header_field(self, data, start, end):
+        self.field += data[start:end]
+
+    def on_header_value(self, data, start, end):
+        self.value += data[start:end]
+
+    def on_header_end(self):
+        self.headers[self.field.lower()] = self.value
+        self.field, self.value = b'', b''
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self.headers.get(b'content-disposition', b''))
+        self.is_file = b'filename' in options
+        self.declared = self.headers.get(b'content-type', b'').decode('latin-1').lower()
+
+    def on_part_data(self, data, start, end):
+        if not self.is_file:
+            return
+        self.size += end - start
+        if self.limit is None:
+            self.head += data[start:min(end, start + SNIFF_BYTES - len(self.head))]
+            if len(self.head) >= SNIFF_BYTES:
+                self.check_signature()
+        if self.limit is not None and self.size > self.limit:
+            raise HTTPException(status_code=413, detail=f'File too large. The limit for this type is {self.limit} bytes.')
+
+    def on_part_end(self):
+        if self.is_file and self.limit is None:
+            self.check_signature()
+
+    def check_signature(self):
+        detected = sniff_media_type(self.head)
+        if not detected or detected.split('/')[0] not in self.limits:
+            raise HTTPException(status_code=415, detail="Unsupported File uploaded. Please upload image or video file!")
+        if detected.split('/')[0] != self.declared.split('/')[0]:
+            raise HTTPException(status_code=415, detail=f"File content is {detected} but was sent as {self.declared or 'unknown'}.")
+        self.limit = self.limits[detected.split('/')[0]]
+
+class UploadGuardMiddleware:
+    """Runs MultipartInspector over multipart POSTs to the given paths.
+
+    The HTTPException raised from `receive` surfaces while FastAPI is still reading
+    the form, so the client gets the 413/415 without the rest of the body being stored.
+    """
+
+    def __init__(self, app, paths, limits):
+        self.app = app
+        self.paths = set(paths)
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] != 'POST' or scope['path'] not in self.paths:
+            return await self.app(scope, receive, send)
+        content_type, options = parse_options_header(Headers(scope=scope).get('content-type', ''))
+        if content_type != b'multipart/form-data' or b'boundary' not in options:
+            return await self.app(scope, receive, send)
+
+        inspector = MultipartInspector(options[b'boundary'], self.limits)
+
+        async def guarded_receive():
+            message = await receive()
+            if message['type'] == 'http.request':
+                inspector.feed(message.get('body', b''))
+            return message
+
+        await self.app(scope, guarded_receive, send)
@@ -0,0 +1,43 @@
+"""Per-URL cost of presigning a feed page: boto3 generate_presigned_url vs BatchSigner.
+
+Signing is local, so no object store is needed:
+
+    python benchmarks/presign_batch.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+import boto3
+from config.signing import BatchSigner
+
+ENDPOINT = 'http://localhost:9000'
+BUCKET = 'bench'
+ROUNDS = 50
+
+def main():
+    client = boto3.client(
+        's3', endpoint_url=ENDPOINT, region_name='us-east-1',
+        aws_access_key_id='bench', aws_secret_access_key='bench'
+    )
+    signer = BatchSigner(ENDPOINT, BUCKET, 'bench', 'bench')
+
+    print(f'{"batch":>6}{"boto3 us/url":>15}{"batch us/url":>15}{"speedup":>10}')
+    for batch in (1, 30, 100):
+        keys = [f'posts/{i}_photo.jpg' for i in range(batch)]
+
+        def per_call():
+            for key in keys:
+                client.generate_presigned_url('get_object', Params={'Bucket': BUCKET, 'Key': key}, ExpiresIn=3600)
+
+        def batched():
+            signer.sign(keys, 3600)
+
+        boto_cost = min(timeit.repeat(per_call, number=ROUNDS, repeat=3)) / (ROUNDS * batch)
+        batch_cost = min(timeit.repeat(batched, number=ROUNDS, repeat=3)) / (ROUNDS * batch)
+        print(f'{batch:>6}{boto_cost * 1e6:>15.1f}{batch_cost * 1e6:>15.1f}{boto_cost / batch_cost:>9.1f}x')
+
+if __name__ == '__main__':
+    main()
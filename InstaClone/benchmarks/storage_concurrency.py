@@ -0,0 +1,98 @@
+"""Event-loop latency while slow uploads are in flight: blocking boto3 vs AsyncStorage.
+
+Object storage is stood in by moto with an artificial delay on every PUT, so no
+MinIO is needed:
+
+    python benchmarks/storage_concurrency.py
+"""
+import os
+import sys
+import time
+import asyncio
+import statistics
+
+os.environ.setdefault('MY_BUCKET', 'bench')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'bench')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'bench')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+import httpx
+from moto import mock_aws
+from fastapi import FastAPI
+
+UPLOAD_DELAY = 0.5
+SLOW_UPLOADS = 8
+PINGS = 40
+PING_INTERVAL = 0.05
+
+class SlowClient:
+    """Delegates to a real boto3 client but sleeps first, like a MinIO brownout."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def put_object(self, **kwargs):
+        time.sleep(UPLOAD_DELAY)
+        return self.client.put_object(**kwargs)
+
+def build_app(slow_client, bucket):
+    from config.storage import AsyncStorage
+    adapter = AsyncStorage(slow_client, bucket)
+    app = FastAPI()
+
+    @app.post('/blocking')
+    async def blocking():
+        slow_client.put_object(Bucket=bucket, Key='blocking', Body=b'x')
+        return {}
+
+    @app.post('/adapter')
+    async def non_blocking():
+        await adapter.put_object('adapter', b'x')
+        return {}
+
+    @app.get('/ping')
+    async def ping():
+        return {}
+
+    return app
+
+async def measure(app, upload_path):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        async def timed_ping(i):
+            # Latency is taken from when the ping was due, so time spent stuck behind
+            # a blocked event loop counts against it
+            due = start + i * PING_INTERVAL
+            await asyncio.sleep(max(0, due - loop.time()))
+            await client.get('/ping')
+            return loop.time() - due
+
+        async def upload(i):
+            await asyncio.sleep(i * UPLOAD_DELAY / 2)
+            await client.post(upload_path)
+
+        results = await asyncio.gather(
+            *(timed_ping(i) for i in range(PINGS)), *(upload(i) for i in range(SLOW_UPLOADS))
+        )
+    latencies = sorted(results[:PINGS])
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1], latencies[-1]
+
+def main():
+    with mock_aws():
+        import boto3
+        bucket = os.environ['MY_BUCKET']
+        client = boto3.client('s3')
+        client.create_bucket(Bucket=bucket)
+        app = build_app(SlowClient(client), bucket)
+        print(f'{SLOW_UPLOADS} uploads of {UPLOAD_DELAY}s each in flight, {PINGS} pings')
+        print(f'{"mode":<10}{"p50 ms":>10}{"p95 ms":>10}{"max ms":>10}')
+        for mode in ('blocking', 'adapter'):
+            p50, p95, worst = asyncio.run(measure(app, f'/{mode}'))
+            print(f'{mode:<10}{p50 * 1000:>10.1f}{p95 * 1000:>10.1f}{worst * 1000:>10.1f}')
+
+if __name__ == '__main__':
+    main()